@@ -4,6 +4,7 @@ Airline and booking site patterns for detecting flight confirmation emails.
 Also includes airline hub/focus city data for validating airport codes.
 """
 
+import functools
 import re
 
 # Airline IATA codes (2-letter) for flight number extraction
@@ -222,7 +223,11 @@ AIRLINE_NAME_VARIATIONS = {
     'volaris': 'Volaris',
 }
 
-# Airline and booking site patterns to detect flight confirmation emails
+# Airline and booking site patterns to detect flight confirmation emails.
+# Reference data only: is_flight_email matches on the sender token tables
+# below and checks generic flight subjects with its own compiled regex
+# (_STRONG_INDICATOR_RE) as the last step, so the catch-all ".*" entry at
+# the end of this list is never evaluated per email.
 AIRLINE_PATTERNS = [
     # Major US Airlines
     {
@@ -340,6 +345,105 @@ AIRLINE_PATTERNS = [
 ]
 
 
+# Sender tokens for is_flight_email, built once at import rather than per call.
+# Known airline domains - if from any of these, it's likely flight-related
+FLIGHT_SENDER_AIRLINES = {
+    'jetblue': 'JetBlue',
+    'delta': 'Delta',
+    'united': 'United',
+    'aa.com': 'American Airlines',
+    'americanairlines': 'American Airlines',
+    'southwest': 'Southwest',
+    'alaskaair': 'Alaska Airlines',
+    'spirit': 'Spirit',
+    'flyfrontier': 'Frontier',
+    'hawaiianairlines': 'Hawaiian Airlines',
+    'aircanada': 'Air Canada',
+    'britishairways': 'British Airways',
+    'lufthansa': 'Lufthansa',
+    'emirates': 'Emirates',
+    'airfrance': 'Air France',
+    'klm': 'KLM',
+    'qantas': 'Qantas',
+    'singapore': 'Singapore Airlines',
+    'cathay': 'Cathay Pacific',
+    'westjet': 'WestJet',
+    'avianca': 'Avianca',
+    'aeromexico': 'Aeromexico',
+    'latam': 'LATAM',
+    'copa': 'Copa',
+    'turkish': 'Turkish Airlines',
+    'qatar': 'Qatar Airways',
+    'etihad': 'Etihad',
+    'icelandair': 'Icelandair',
+    'norwegian': 'Norwegian',
+    'ryanair': 'Ryanair',
+    'easyjet': 'easyJet',
+    'virgin': 'Virgin Atlantic',
+}
+
+# Credit card/banking alerts that mention airlines
+FLIGHT_SENDER_EXCLUSIONS = ('barclays', 'chase', 'amex')
+
+# Booking sites send lots of marketing so we need subject keywords
+BOOKING_SITES = ('expedia', 'kayak', 'priceline', 'orbitz', 'travelocity',
+                 'cheapoair', 'hopper', 'skyscanner', 'booking.com', 'trip.com')
+BOOKING_KEYWORDS = ('confirmation', 'itinerary', 'receipt', 'e-ticket',
+                    'trip details', 'booking', 'reservation')
+
+CORPORATE_TRAVEL_TOOLS = ('concur', 'egencia', 'tripactions', 'navan', 'travelperk')
+
+# Subject phrases that indicate a flight email from any sender
+STRONG_FLIGHT_INDICATORS = (
+    'flight confirmation',
+    'e-ticket',
+    'eticket',
+    'boarding pass',
+    'check-in',
+    'checkin',
+    'your flight to',
+    'your trip to',
+)
+
+
+def _alternation(tokens):
+    """Join literal tokens into one regex alternation."""
+    return '|'.join(re.escape(token) for token in tokens)
+
+
+def _build_sender_re():
+    """Fuse every airline sender token into one regex for a single scan of From.
+
+    Each airline gets a named group (sanitized airline name); _SENDER_GROUPS
+    maps them back in table order so the first listed airline still wins
+    when a sender contains tokens for more than one. The branches are
+    zero-width lookaheads so tokens that overlap each other all report.
+    """
+    tokens_by_airline = {}
+    for token, airline_name in FLIGHT_SENDER_AIRLINES.items():
+        tokens_by_airline.setdefault(airline_name, []).append(token)
+
+    groups = {}
+    branches = []
+    for airline_name, tokens in tokens_by_airline.items():
+        group = re.sub(r'\W', '_', airline_name)
+        groups[group] = airline_name
+        branches.append(f'(?=(?P<{group}>{_alternation(tokens)}))')
+    return re.compile('|'.join(branches)), groups
+
+
+# The From header is scanned once for every airline token; the other
+# sender lists and the subject checks only run for the steps that need
+# them. Tokens are lowercase and is_flight_email lowercases its input, so
+# no IGNORECASE is needed.
+_SENDER_RE, _SENDER_GROUPS = _build_sender_re()
+_EXCLUSION_RE = re.compile(_alternation(FLIGHT_SENDER_EXCLUSIONS))
+_BOOKING_SITE_RE = re.compile(_alternation(BOOKING_SITES))
+_CORPORATE_TOOL_RE = re.compile(_alternation(CORPORATE_TRAVEL_TOOLS))
+_BOOKING_KEYWORD_RE = re.compile(_alternation(BOOKING_KEYWORDS))
+_STRONG_INDICATOR_RE = re.compile(_alternation(STRONG_FLIGHT_INDICATORS))
+
+
 def is_flight_email(from_addr, subject):
     """Check if email is from an airline and MIGHT contain flight information.
 
@@ -357,86 +461,41 @@ def is_flight_email(from_addr, subject):
     Returns:
         Tuple of (is_match, airline_name) or (False, None)
     """
-    from_addr = (from_addr or "").lower()
-    subject = (subject or "").lower()
-
-    # Known airline domains - if from any of these, it's likely flight-related
-    airline_domains = {
-        'jetblue': 'JetBlue',
-        'delta': 'Delta',
-        'united': 'United',
-        'aa.com': 'American Airlines',
-        'americanairlines': 'American Airlines',
-        'southwest': 'Southwest',
-        'alaskaair': 'Alaska Airlines',
-        'spirit': 'Spirit',
-        'flyfrontier': 'Frontier',
-        'hawaiianairlines': 'Hawaiian Airlines',
-        'aircanada': 'Air Canada',
-        'britishairways': 'British Airways',
-        'lufthansa': 'Lufthansa',
-        'emirates': 'Emirates',
-        'airfrance': 'Air France',
-        'klm': 'KLM',
-        'qantas': 'Qantas',
-        'singapore': 'Singapore Airlines',
-        'cathay': 'Cathay Pacific',
-        'westjet': 'WestJet',
-        'avianca': 'Avianca',
-        'aeromexico': 'Aeromexico',
-        'latam': 'LATAM',
-        'copa': 'Copa',
-        'turkish': 'Turkish Airlines',
-        'qatar': 'Qatar Airways',
-        'etihad': 'Etihad',
-        'icelandair': 'Icelandair',
-        'norwegian': 'Norwegian',
-        'ryanair': 'Ryanair',
-        'easyjet': 'easyJet',
-        'virgin': 'Virgin Atlantic',
-    }
+    return _classify((from_addr or "").lower(), subject or "")
+
+
+@functools.lru_cache(maxsize=4096)
+def _classify(from_addr, subject):
+    """is_flight_email on a lowercased sender (memoized).
+
+    The same sender/subject pair is checked at header triage and again after
+    the full download, and airline mailings repeat subjects verbatim.
+    """
+    airline_hits = {m.lastgroup for m in _SENDER_RE.finditer(from_addr)}
 
     # STEP 1: Check if from a known airline domain (most reliable)
-    for domain, airline_name in airline_domains.items():
-        if domain in from_addr:
-            # Exclude credit card/banking alerts that mention airlines
-            if 'barclays' in from_addr or 'chase' in from_addr or 'amex' in from_addr:
-                continue
-            return True, airline_name
+    # Exclude credit card/banking alerts that mention airlines
+    if airline_hits and not _EXCLUSION_RE.search(from_addr):
+        for group, airline_name in _SENDER_GROUPS.items():
+            if group in airline_hits:
+                return True, airline_name
 
-    # STEP 2: Check booking sites with subject filtering
-    # These send lots of marketing so we need subject keywords
-    booking_sites = ['expedia', 'kayak', 'priceline', 'orbitz', 'travelocity',
-                     'cheapoair', 'hopper', 'skyscanner', 'booking.com', 'trip.com']
-    booking_keywords = ['confirmation', 'itinerary', 'receipt', 'e-ticket',
-                        'trip details', 'booking', 'reservation']
+    # Only now is the subject needed: airline senders have already returned
+    subject = subject.lower()
 
-    for site in booking_sites:
-        if site in from_addr:
-            if any(kw in subject for kw in booking_keywords):
-                return True, "Booking Site"
+    # STEP 2: Check booking sites with subject filtering
+    if _BOOKING_SITE_RE.search(from_addr) and _BOOKING_KEYWORD_RE.search(subject):
+        return True, "Booking Site"
 
     # STEP 3: Check corporate travel tools
-    corporate_tools = ['concur', 'egencia', 'tripactions', 'navan', 'travelperk']
-    for tool in corporate_tools:
-        if tool in from_addr:
-            # Corporate tools usually send real bookings, not marketing
-            return True, "Corporate Travel"
+    # Corporate tools usually send real bookings, not marketing
+    if _CORPORATE_TOOL_RE.search(from_addr):
+        return True, "Corporate Travel"
 
     # STEP 4: Generic catch-all - subject contains strong flight indicators
-    strong_indicators = [
-        'flight confirmation',
-        'e-ticket',
-        'eticket',
-        'boarding pass',
-        'check-in',
-        'checkin',
-        'your flight to',
-        'your trip to',
-    ]
-    for indicator in strong_indicators:
-        if indicator in subject:
-            return True, "Generic Flight"
+    # (subject-only, so it needs no sender match and runs once, last)
+    if _STRONG_INDICATOR_RE.search(subject):
+        return True, "Generic Flight"
 
     return False, None
 
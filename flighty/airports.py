@@ -287,10 +287,11 @@ def load_airport_codes(codes_file=None):
 def _initialize():
     """Initialize module-level data."""
     all_codes, names_from_file = load_airport_codes()
-    valid_codes = all_codes - EXCLUDED_CODES
+    # Read-only lookup tables shared by the parser, scanner and reports
+    valid_codes = frozenset(all_codes - EXCLUDED_CODES)
     # Merge names: use friendly names first, then file names
     all_names = {**names_from_file, **FRIENDLY_NAMES}
-    return all_codes, valid_codes, all_names
+    return frozenset(all_codes), valid_codes, all_names
 
 
 # Module-level initialized data
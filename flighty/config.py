@@ -2,13 +2,20 @@
 Configuration and data persistence management.
 """
 
+import contextlib
 import json
+import os
 from pathlib import Path
 
 # Default paths (can be overridden)
 _DATA_DIR = Path(__file__).parent.parent
 CONFIG_FILE = _DATA_DIR / "config.json"
 PROCESSED_FILE = _DATA_DIR / "processed_flights.json"
+SCAN_STATE_FILE = _DATA_DIR / "scan_state.json"
+
+# Fold the progress log back into processed_flights.json once it holds
+# this many entries
+PROGRESS_LOG_COMPACT_ENTRIES = 200
 
 # Email provider presets for setup wizard
 EMAIL_PROVIDERS = {
@@ -124,9 +131,16 @@ def save_config(config, config_file=None):
         json.dump(config, f, indent=2)
 
 
+def _processed_log_path(processed_path):
+    """Append-only progress log that sits next to processed_flights.json."""
+    return processed_path.with_suffix('.log')
+
+
 def load_processed_flights(processed_file=None):
     """Load dictionary of processed flights with error handling and validation.
 
+    Flights recorded in the progress log since the last save are merged in.
+
     Args:
         processed_file: Path to processed file. Defaults to processed_flights.json.
 
@@ -137,6 +151,15 @@ def load_processed_flights(processed_file=None):
         processed_file = PROCESSED_FILE
 
     processed_path = Path(processed_file)
+    data = _load_processed_json(processed_path)
+    replayed = _replay_processed_log(data, _processed_log_path(processed_path))
+    if replayed >= PROGRESS_LOG_COMPACT_ENTRIES:
+        save_processed_flights(data, processed_path)
+    return data
+
+
+def _load_processed_json(processed_path):
+    """Read processed_flights.json, falling back to empty tracking data."""
     default_data = {"confirmations": {}, "content_hashes": set()}
 
     if not processed_path.exists():
@@ -183,9 +206,105 @@ def load_processed_flights(processed_file=None):
         return default_data
 
 
+def _replay_processed_log(data, log_path):
+    """Apply progress log entries on top of loaded processed data.
+
+    Returns:
+        Number of entries applied.
+    """
+    if not log_path.exists():
+        return 0
+
+    replayed = 0
+    try:
+        with open(log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    data["confirmations"][entry["confirmation"]] = entry["info"]
+                    data["content_hashes"].add(entry["content_hash"])
+                    replayed += 1
+                except (ValueError, KeyError, TypeError):
+                    # A crash mid-write can leave a partial last line
+                    continue
+    except Exception as e:
+        print(f"Warning: Could not read progress log ({e})")
+    return replayed
+
+
+@contextlib.contextmanager
+def progress_log(processed_file=None):
+    """Open the progress log for a run of record_processed_flight() calls.
+
+    The file stays open and line-buffered, so every entry reaches disk as
+    soon as it is written without reopening the file per flight.
+
+    Args:
+        processed_file: Path to processed file. Defaults to processed_flights.json.
+
+    Yields:
+        Open log file, or None if it could not be opened.
+    """
+    if processed_file is None:
+        processed_file = PROCESSED_FILE
+
+    log_path = _processed_log_path(Path(processed_file))
+    try:
+        # A crash mid-write can leave the last entry cut short - start on a
+        # fresh line so the next entry isn't glued onto it and lost on replay
+        partial = False
+        if log_path.exists() and log_path.stat().st_size:
+            with open(log_path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                partial = f.read(1) != b'\n'
+        log = open(log_path, 'a', encoding='utf-8', buffering=1)
+        if partial:
+            log.write("\n")
+    except Exception as e:
+        print(f"\n    Warning: Could not save progress ({e})")
+        log = None
+
+    try:
+        yield log
+    finally:
+        if log is not None:
+            log.close()
+
+
+def record_processed_flight(processed, conf_key, info, content_hash, log):
+    """Mark a flight as imported and append it to the progress log.
+
+    Appending one line per flight keeps progress crash-safe without
+    rewriting processed_flights.json after every send. The log is folded
+    back into the JSON file once it grows past PROGRESS_LOG_COMPACT_ENTRIES
+    (see load_processed_flights).
+
+    Args:
+        processed: Dict with 'confirmations' and 'content_hashes' keys.
+        conf_key: Confirmation code (or fallback key) of the flight.
+        info: Details stored under the confirmation.
+        content_hash: Content hash of the forwarded email.
+        log: Log file from progress_log(), or None to only update memory.
+    """
+    processed["confirmations"][conf_key] = info
+    processed["content_hashes"].add(content_hash)
+
+    if log is None:
+        return
+
+    entry = {"confirmation": conf_key, "info": info, "content_hash": content_hash}
+    try:
+        log.write(json.dumps(entry) + "\n")
+    except Exception as e:
+        print(f"\n    Warning: Could not save progress ({e})")
+
+
 def save_processed_flights(processed, processed_file=None):
     """Save processed flights data with atomic write for crash protection.
 
+    Once the full data is written the progress log is no longer needed
+    and is removed.
+
     Args:
         processed: Dict with 'confirmations' and 'content_hashes' keys.
         processed_file: Path to processed file. Defaults to processed_flights.json.
@@ -207,6 +326,10 @@ def save_processed_flights(processed, processed_file=None):
 
         # Atomic rename
         temp_file.replace(processed_path)
+
+        log_path = _processed_log_path(processed_path)
+        if log_path.exists():
+            log_path.unlink()
     except Exception as e:
         print(f"\n    Warning: Could not save progress ({e})")
         # Try to clean up temp file
@@ -217,23 +340,77 @@ def save_processed_flights(processed, processed_file=None):
             pass
 
 
+def load_scan_state(state_file=None):
+    """Load per-folder incremental scan state.
+
+    Args:
+        state_file: Path to state file. Defaults to scan_state.json.
+
+    Returns:
+        Dict of folder key -> state dict (empty if missing or unreadable).
+    """
+    if state_file is None:
+        state_file = SCAN_STATE_FILE
+
+    state_path = Path(state_file)
+    if not state_path.exists():
+        return {}
+
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        return state if isinstance(state, dict) else {}
+    except Exception:
+        # Losing scan state only costs one full rescan
+        return {}
+
+
+def save_scan_state(state, state_file=None):
+    """Save per-folder incremental scan state with an atomic write.
+
+    Args:
+        state: Dict of folder key -> state dict.
+        state_file: Path to state file. Defaults to scan_state.json.
+    """
+    if state_file is None:
+        state_file = SCAN_STATE_FILE
+
+    state_path = Path(state_file)
+    temp_file = state_path.with_suffix('.json.tmp')
+    try:
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        temp_file.replace(state_path)
+    except Exception:
+        try:
+            if temp_file.exists():
+                temp_file.unlink()
+        except Exception:
+            pass
+
+
 def reset_processed_flights(processed_file=None):
-    """Delete processed flights tracking file.
+    """Delete processed flights tracking files.
+
+    Removes the tracking JSON, its progress log and the incremental scan
+    state, so every folder is searched in full on the next run.
 
     Args:
         processed_file: Path to processed file. Defaults to processed_flights.json.
 
     Returns:
-        True if file was deleted, False otherwise.
+        True if any of those files was deleted, False otherwise.
     """
     if processed_file is None:
         processed_file = PROCESSED_FILE
 
     processed_path = Path(processed_file)
-    if processed_path.exists():
-        processed_path.unlink()
-        return True
-    return False
+    removed = False
+    for path in (processed_path, _processed_log_path(processed_path), SCAN_STATE_FILE):
+        if path.exists():
+            path.unlink()
+            removed = True
+    return removed
 
 
 def clean_data_files(processed_file=None):
@@ -253,8 +430,11 @@ def clean_data_files(processed_file=None):
 
     files_to_clean = [
         processed_path,
+        _processed_log_path(processed_path),
         processed_path.with_suffix('.json.tmp'),
         processed_path.with_suffix('.json.bak'),
+        SCAN_STATE_FILE,
+        SCAN_STATE_FILE.with_suffix('.json.tmp'),
     ]
 
     for f in files_to_clean:
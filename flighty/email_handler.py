@@ -5,15 +5,182 @@ Email handling: IMAP connection, SMTP forwarding, email parsing.
 import imaplib
 import logging
 import smtplib
+import codecs
+import contextlib
 import email
 import email.header
+import functools
 import re
+import socket
+import sys
+import threading
 import time
 from datetime import datetime, timedelta
+from email.parser import BytesParser
+from email.policy import compat32, default as default_policy
 from email.utils import parsedate_to_datetime
 
 logger = logging.getLogger(__name__)
 
+# Authenticated IMAP sessions keyed by (imap_server, email, thread id), reused
+# across calls to connect_imap so TLS + LOGIN is only paid once per run and
+# per scanning thread (an IMAP connection can only run one command at a time)
+_IMAP_POOL = {}
+_IMAP_POOL_LOCK = threading.Lock()
+
+# Authenticated SMTP sessions keyed by (smtp_server, email, thread id), reused
+# across forward_email calls so STARTTLS + AUTH is only paid once per sender
+# thread (smtplib connections must not be shared between threads)
+_SMTP_POOL = {}
+_SMTP_POOL_LOCK = threading.Lock()
+
+# Substrings of a (lowercased) SMTP error that mean throttling or a dropped
+# connection, matched in one regex pass
+_RATE_LIMIT_RE = re.compile(
+    r'rate|limit|too many|try again|temporarily'
+    r'|421|450|451|452|454|554'
+    r'|connection|closed|reset|refused|timeout'
+)
+
+# Encoded text parts larger than this (~1MB once base64-decoded) are skipped
+MAX_TEXT_PAYLOAD_CHARS = 1_500_000
+
+# IMAP socket timeouts (seconds): connecting/login, then any later command
+IMAP_CONNECT_TIMEOUT = 60
+IMAP_OPERATION_TIMEOUT = 300
+
+# Keep UID FETCH command lines well under server request-size limits
+MAX_FETCH_ID_BYTES = 1000
+_FETCH_UID_RE = re.compile(rb'UID\s+(\d+)')
+
+# All parsing uses the default policy, which decodes RFC 2047 headers on access
+_PARSER = BytesParser(policy=default_policy)
+
+
+# connect_imap failure messages - only formatted when a connection fails
+_ERROR_MSGS = {
+    'login': """
+  ╔════════════════════════════════════════════════════════════╗
+  ║  LOGIN FAILED                                              ║
+  ╚════════════════════════════════════════════════════════════╝
+
+  Error: {err}
+
+{hint}
+""",
+    'login_credentials': """\
+  This usually means:
+    • You're using your regular password instead of an App Password
+    • The App Password was entered incorrectly
+
+  To fix: Run 'python3 run.py --setup' and enter a new App Password""",
+    'login_imap_disabled': """\
+  This usually means IMAP access is disabled in your email settings.
+  Enable IMAP access in your email provider's settings.""",
+    'login_other': """\
+  Make sure you're using an App Password, not your regular password.
+  Run 'python3 run.py --setup' to reconfigure.""",
+    'timeout': f"""
+  ╔════════════════════════════════════════════════════════════╗
+  ║  CONNECTION TIMED OUT                                      ║
+  ╚════════════════════════════════════════════════════════════╝
+
+  Could not connect to the email server within {IMAP_CONNECT_TIMEOUT} seconds.
+
+  This could mean:
+    • Your internet connection is slow or unstable
+    • The email server is temporarily unavailable
+    • A firewall is blocking the connection
+
+  Try again in a few minutes.
+""",
+    'not_found': """
+  ╔════════════════════════════════════════════════════════════╗
+  ║  SERVER NOT FOUND                                          ║
+  ╚════════════════════════════════════════════════════════════╝
+
+  Could not find server: {server}
+
+  This could mean:
+    • No internet connection
+    • The server address is incorrect
+
+  Run 'python3 run.py --setup' to check your settings.
+""",
+    'refused': """
+  ╔════════════════════════════════════════════════════════════╗
+  ║  CONNECTION REFUSED                                        ║
+  ╚════════════════════════════════════════════════════════════╝
+
+  The server {server} refused the connection.
+
+  This could mean:
+    • The port number is incorrect (should be 993 for IMAP SSL)
+    • The server doesn't allow IMAP connections
+
+  Run 'python3 run.py --setup' to check your settings.
+""",
+    'unexpected': """
+  ╔════════════════════════════════════════════════════════════╗
+  ║  CONNECTION ERROR                                          ║
+  ╚════════════════════════════════════════════════════════════╝
+
+  Unexpected error: {err}
+
+  Try running 'python3 run.py --setup' to reconfigure,
+  or try again in a few minutes.
+""",
+}
+
+
+def parse_headers_only(raw_bytes):
+    """Parse just the headers of a raw email (the body is not MIME-parsed).
+
+    Uses the default policy, so msg['From'] / msg['Subject'] come back
+    already decoded and don't need decode_header_value.
+
+    Args:
+        raw_bytes: Raw email or header block bytes
+
+    Returns:
+        email.message.EmailMessage with headers populated
+    """
+    return _PARSER.parsebytes(raw_bytes, headersonly=True)
+
+
+def parse_full(raw_bytes):
+    """Fully parse a raw email, including its MIME body.
+
+    Only call this for emails that passed header triage - it is the
+    expensive step for large HTML confirmations.
+
+    Args:
+        raw_bytes: Raw email bytes
+
+    Returns:
+        email.message.EmailMessage object
+    """
+    return _PARSER.parsebytes(raw_bytes)
+
+
+def get_header(msg, name):
+    """Get a header from a parsed email as a decoded string.
+
+    Messages from parse_headers_only / parse_full already decode headers on
+    access; decode_header_value is only needed for legacy (compat32) messages.
+
+    Args:
+        msg: Parsed email message
+        name: Header name, e.g. 'Subject'
+
+    Returns:
+        Decoded header string, or "" if missing
+    """
+    value = msg.get(name, '')
+    if msg.policy is compat32:
+        return decode_header_value(value)
+    return str(value)
+
 
 def decode_header_value(value):
     """Decode an email header value (handles encoded headers).
@@ -36,6 +203,19 @@ def decode_header_value(value):
         return str(value)
 
 
+@functools.lru_cache(maxsize=64)
+def _normalize_charset(charset):
+    """Resolve a declared charset to its canonical codec name.
+
+    Returns:
+        Codec name, or None if Python doesn't know the charset
+    """
+    try:
+        return codecs.lookup(charset).name
+    except (LookupError, TypeError):
+        return None
+
+
 def _decode_payload(part):
     """Decode an email part's payload with proper charset handling.
 
@@ -46,48 +226,71 @@ def _decode_payload(part):
         Decoded string or empty string on failure
     """
     try:
+        # Don't decode oversized parts (usually embedded images/PDFs mislabelled
+        # as text) - no real confirmation body is anywhere near this big
+        raw = part.get_payload(decode=False)
+        if isinstance(raw, str) and len(raw) > MAX_TEXT_PAYLOAD_CHARS:
+            logger.debug("Skipping %d-char %s part", len(raw), part.get_content_type())
+            return ""
+
         payload = part.get_payload(decode=True)
         if not payload:
             return ""
 
-        # Try to get the charset from the email part
+        # Use the declared charset when Python recognises it, else UTF-8
         charset = part.get_content_charset()
+        codec = (_normalize_charset(charset) if charset else None) or 'utf-8'
 
-        # Common charset aliases and fallbacks
-        charset_attempts = []
-        if charset:
-            charset_attempts.append(charset.lower())
-            # Handle common aliases
-            if charset.lower() in ('iso-8859-1', 'latin-1', 'latin1'):
-                charset_attempts.extend(['iso-8859-1', 'cp1252', 'windows-1252'])
-            elif charset.lower() in ('windows-1252', 'cp1252'):
-                charset_attempts.extend(['cp1252', 'iso-8859-1'])
-
-        # Always try these common encodings as fallbacks
-        charset_attempts.extend(['utf-8', 'iso-8859-1', 'cp1252', 'ascii'])
-
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_charsets = []
-        for c in charset_attempts:
-            if c not in seen:
-                seen.add(c)
-                unique_charsets.append(c)
-
-        # Try each charset
-        for cs in unique_charsets:
-            try:
-                return payload.decode(cs)
-            except (UnicodeDecodeError, LookupError):
-                continue
-
-        # Last resort: decode with replacement characters
-        return payload.decode('utf-8', errors='replace')
+        try:
+            return payload.decode(codec)
+        except UnicodeDecodeError:
+            # Last resort: decode with replacement characters
+            return payload.decode('utf-8', errors='replace')
 
     except Exception:
         return ""
 
 
+def _part_content_info(part):
+    """Return (content_type, disposition) of a MIME part from its raw headers.
+
+    With the default policy every get_content_type() / get_content_disposition()
+    call builds a structured header object (a pure-Python parse), but only the
+    token before the first ';' is needed here.
+    """
+    content_type = None
+    disposition = None
+    for name, value in part.raw_items():
+        name = name.lower()
+        if name == 'content-type' and content_type is None:
+            content_type = str(value).split(';', 1)[0].strip().lower()
+        elif name == 'content-disposition' and disposition is None:
+            disposition = str(value).split(';', 1)[0].strip().lower()
+
+    # Same fallbacks as Message.get_content_type()
+    if content_type is None:
+        content_type = part.get_default_type()
+    elif content_type.count('/') != 1:
+        content_type = 'text/plain'
+    return content_type, disposition
+
+
+def _iter_text_parts(msg):
+    """Yield (content_type, part) for each inline text/plain or text/html part.
+
+    The tree is walked once and nothing is decoded here; parts are
+    classified from their raw Content-Type / Content-Disposition headers.
+    """
+    for part in msg.walk():
+        content_type, disposition = _part_content_info(part)
+        if content_type not in ("text/plain", "text/html"):
+            continue
+        # Skip attachments
+        if disposition == "attachment":
+            continue
+        yield content_type, part
+
+
 def get_email_body(msg):
     """Extract the email body (plain text and HTML).
 
@@ -101,28 +304,14 @@ def get_email_body(msg):
     html_body = ""
 
     if msg.is_multipart():
-        for part in msg.walk():
-            content_type = part.get_content_type()
-            content_disposition = str(part.get("Content-Disposition", ""))
-
-            # Skip attachments
-            if "attachment" in content_disposition:
-                continue
-
-            # Skip multipart containers - they don't have payload we can decode
-            if content_type.startswith("multipart/"):
-                continue
-
+        # Prefer the larger part when an email has several of the same type
+        for content_type, part in _iter_text_parts(msg):
             text = _decode_payload(part)
-            if text:
-                if content_type == "text/plain":
-                    # Prefer larger plain text (some emails have multiple text/plain parts)
-                    if len(text) > len(body):
-                        body = text
-                elif content_type == "text/html":
-                    # Prefer larger HTML (some emails have multiple text/html parts)
-                    if len(text) > len(html_body):
-                        html_body = text
+            if content_type == "text/plain":
+                if len(text) > len(body):
+                    body = text
+            elif len(text) > len(html_body):
+                html_body = text
     else:
         text = _decode_payload(msg)
         if text:
@@ -134,6 +323,15 @@ def get_email_body(msg):
     return body, html_body
 
 
+@functools.lru_cache(maxsize=8192)
+def _parse_email_date_cached(date_str):
+    """Parse a Date header string (memoized - many emails share the same value)."""
+    try:
+        return parsedate_to_datetime(date_str)
+    except Exception:
+        return datetime.min
+
+
 def parse_email_date(date_str):
     """Parse email date header into datetime.
 
@@ -143,139 +341,320 @@ def parse_email_date(date_str):
     Returns:
         datetime object or datetime.min if parsing fails
     """
-    try:
-        return parsedate_to_datetime(date_str)
-    except Exception:
+    if not date_str or not isinstance(date_str, str):
         return datetime.min
+    return _parse_email_date_cached(date_str)
+
+
+def _open_imap_ssl(host, port, timeout):
+    """Open an IMAP4_SSL connection with a per-socket connect timeout."""
+    if sys.version_info >= (3, 9):
+        return imaplib.IMAP4_SSL(host, port, timeout=timeout)
+
+    # Python 3.8's IMAP4_SSL has no timeout argument - set the default only
+    # for the duration of the connect
+    previous = socket.getdefaulttimeout()
+    socket.setdefaulttimeout(timeout)
+    try:
+        return imaplib.IMAP4_SSL(host, port)
+    finally:
+        socket.setdefaulttimeout(previous)
+
+
+def _disable_nagle(sock):
+    """Turn on TCP_NODELAY so small IMAP/SMTP commands go out immediately."""
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except (AttributeError, OSError):
+        pass
+
+
+def _discard_imap(key):
+    """Drop a pooled IMAP session so the next connect_imap reconnects."""
+    with _IMAP_POOL_LOCK:
+        _IMAP_POOL.pop(key, None)
+
+
+def close_all_connections():
+    """Log out of every pooled IMAP and SMTP session and empty the pools."""
+    with _IMAP_POOL_LOCK:
+        connections = list(_IMAP_POOL.values())
+        _IMAP_POOL.clear()
+
+    for mail in connections:
+        try:
+            mail.logout()
+        except Exception:
+            pass
+
+    with _SMTP_POOL_LOCK:
+        servers = list(_SMTP_POOL.values())
+        _SMTP_POOL.clear()
+
+    for server in servers:
+        try:
+            server.quit()
+        except Exception:
+            pass
 
 
 def connect_imap(config):
     """Connect to the IMAP server.
 
+    Reuses the calling thread's pooled, already-authenticated session for
+    the same server and account when it still answers NOOP; otherwise opens
+    a new one. Threads scanning folders in parallel each get their own.
+
     Args:
         config: Config dict with imap_server, imap_port, email, password
 
     Returns:
         IMAP4_SSL connection or None on failure
     """
-    import socket
+    key = (config['imap_server'], config['email'], threading.get_ident())
+    with _IMAP_POOL_LOCK:
+        mail = _IMAP_POOL.get(key)
+
+    if mail is not None:
+        try:
+            mail.noop()
+            return mail
+        except (imaplib.IMAP4.abort, imaplib.IMAP4.error, OSError):
+            logger.debug("Pooled IMAP session for %s is stale, reconnecting", key[0])
+            _discard_imap(key)
 
     try:
-        # Set socket timeout for connection
-        socket.setdefaulttimeout(60)
-        mail = imaplib.IMAP4_SSL(config['imap_server'], config['imap_port'])
+        # Timeout applies to this connection only - no process-wide socket default
+        mail = _open_imap_ssl(config['imap_server'], config['imap_port'], IMAP_CONNECT_TIMEOUT)
+        _disable_nagle(mail.sock)
         mail.login(config['email'], config['password'])
-        # Reset to no timeout for long operations
-        socket.setdefaulttimeout(None)
+        # Longer (but still bounded) timeout for big FETCHes so a hung
+        # connection eventually fails instead of blocking forever
+        mail.sock.settimeout(IMAP_OPERATION_TIMEOUT)
+        with _IMAP_POOL_LOCK:
+            _IMAP_POOL[key] = mail
         return mail
 
     except imaplib.IMAP4.error as e:
+        _discard_imap(key)
         error_str = str(e).lower()
-        print()
-        print("  ╔════════════════════════════════════════════════════════════╗")
-        print("  ║  LOGIN FAILED                                              ║")
-        print("  ╚════════════════════════════════════════════════════════════╝")
-        print()
-        print(f"  Error: {e}")
-        print()
-
         if 'invalid' in error_str or 'authentication' in error_str or 'credential' in error_str:
-            print("  This usually means:")
-            print("    • You're using your regular password instead of an App Password")
-            print("    • The App Password was entered incorrectly")
-            print()
-            print("  To fix: Run 'python3 run.py --setup' and enter a new App Password")
+            hint = _ERROR_MSGS['login_credentials']
         elif 'disabled' in error_str or 'imap' in error_str:
-            print("  This usually means IMAP access is disabled in your email settings.")
-            print("  Enable IMAP access in your email provider's settings.")
+            hint = _ERROR_MSGS['login_imap_disabled']
         else:
-            print("  Make sure you're using an App Password, not your regular password.")
-            print("  Run 'python3 run.py --setup' to reconfigure.")
-
-        print()
+            hint = _ERROR_MSGS['login_other']
+        print(_ERROR_MSGS['login'].format(err=e, hint=hint))
         return None
 
     except socket.timeout:
-        print()
-        print("  ╔════════════════════════════════════════════════════════════╗")
-        print("  ║  CONNECTION TIMED OUT                                      ║")
-        print("  ╚════════════════════════════════════════════════════════════╝")
-        print()
-        print("  Could not connect to the email server within 60 seconds.")
-        print()
-        print("  This could mean:")
-        print("    • Your internet connection is slow or unstable")
-        print("    • The email server is temporarily unavailable")
-        print("    • A firewall is blocking the connection")
-        print()
-        print("  Try again in a few minutes.")
-        print()
+        print(_ERROR_MSGS['timeout'])
         return None
 
-    except socket.gaierror as e:
-        print()
-        print("  ╔════════════════════════════════════════════════════════════╗")
-        print("  ║  SERVER NOT FOUND                                          ║")
-        print("  ╚════════════════════════════════════════════════════════════╝")
-        print()
-        print(f"  Could not find server: {config['imap_server']}")
-        print()
-        print("  This could mean:")
-        print("    • No internet connection")
-        print("    • The server address is incorrect")
-        print()
-        print("  Run 'python3 run.py --setup' to check your settings.")
-        print()
+    except socket.gaierror:
+        print(_ERROR_MSGS['not_found'].format(server=config['imap_server']))
         return None
 
     except ConnectionRefusedError:
-        print()
-        print("  ╔════════════════════════════════════════════════════════════╗")
-        print("  ║  CONNECTION REFUSED                                        ║")
-        print("  ╚════════════════════════════════════════════════════════════╝")
-        print()
-        print(f"  The server {config['imap_server']} refused the connection.")
-        print()
-        print("  This could mean:")
-        print("    • The port number is incorrect (should be 993 for IMAP SSL)")
-        print("    • The server doesn't allow IMAP connections")
-        print()
-        print("  Run 'python3 run.py --setup' to check your settings.")
-        print()
+        print(_ERROR_MSGS['refused'].format(server=config['imap_server']))
         return None
 
     except Exception as e:
-        print()
-        print("  ╔════════════════════════════════════════════════════════════╗")
-        print("  ║  CONNECTION ERROR                                          ║")
-        print("  ╚════════════════════════════════════════════════════════════╝")
-        print()
-        print(f"  Unexpected error: {e}")
-        print()
-        print("  Try running 'python3 run.py --setup' to reconfigure,")
-        print("  or try again in a few minutes.")
-        print()
+        print(_ERROR_MSGS['unexpected'].format(err=e))
         return None
 
 
-def forward_email(config, msg, from_addr, subject, flight_info=None):
+def _fetch_id_batches(uids, batch_size):
+    """Split UIDs into comma-joined batches capped by count and byte length."""
+    batch = []
+    length = 0
+    for uid in uids:
+        if batch and (len(batch) >= batch_size or length + len(uid) + 1 > MAX_FETCH_ID_BYTES):
+            yield batch
+            batch = []
+            length = 0
+        batch.append(uid)
+        length += len(uid) + 1
+    if batch:
+        yield batch
+
+
+def fetch_messages_bulk(mail, uids, parts='(RFC822)', batch_size=100,
+                        max_retries=3, retry_delay=5, verbose=False,
+                        progress_label='Downloading'):
+    """Fetch many messages with one UID FETCH per batch instead of one per UID.
+
+    Args:
+        mail: Logged-in IMAP connection with a folder selected
+        uids: List of UIDs (bytes)
+        parts: FETCH data items to request
+        batch_size: Maximum number of UIDs per FETCH command
+        max_retries: Attempts per batch before falling back to single fetches
+        retry_delay: Seconds to wait between attempts
+        verbose: Print download progress
+        progress_label: Word shown in front of the progress counter
+
+    Returns:
+        Dict of UID (bytes) -> raw message bytes for every message fetched
+    """
+    results = {}
+    total = len(uids)
+    processed = 0
+
+    for batch in _fetch_id_batches(uids, batch_size):
+        data = None
+        for attempt in range(max_retries):
+            try:
+                result, data = mail.uid('fetch', b','.join(batch), parts)
+                if result == 'OK':
+                    break
+                data = None
+            except Exception:
+                data = None
+            if attempt < max_retries - 1:
+                time.sleep(retry_delay)
+
+        if data is not None:
+            for item in data:
+                if isinstance(item, tuple) and len(item) >= 2 and item[1]:
+                    uid_match = _FETCH_UID_RE.search(item[0])
+                    if uid_match:
+                        results[uid_match.group(1)] = item[1]
+
+        # Fetch anything the batch didn't return one message at a time - the
+        # whole batch if it kept failing, otherwise UIDs missing from a
+        # partial response or whose UID the response didn't label
+        for uid in batch:
+            if uid in results:
+                continue
+            try:
+                result, msg_data = mail.uid('fetch', uid, parts)
+                if result == 'OK' and msg_data and isinstance(msg_data[0], tuple):
+                    results[uid] = msg_data[0][1]
+            except Exception:
+                logger.debug("Failed to fetch UID %r", uid)
+
+        processed += len(batch)
+        if verbose:
+            print(f"\r      {progress_label}... {processed}/{total}" + " " * 10, end="", flush=True)
+
+    if verbose and total:
+        print()
+
+    return results
+
+
+def _discard_smtp(key):
+    """Drop a pooled SMTP session (it may be poisoned after an error)."""
+    with _SMTP_POOL_LOCK:
+        server = _SMTP_POOL.pop(key, None)
+
+    if server is not None:
+        try:
+            server.close()
+        except Exception:
+            pass
+
+
+def _smtp_key(config):
+    """Pool key for the calling thread's SMTP session."""
+    return (config['smtp_server'], config['email'], threading.get_ident())
+
+
+def _get_smtp(config):
+    """Return the calling thread's logged-in SMTP session, connecting if needed.
+
+    Args:
+        config: Config dict with smtp_server, smtp_port, email, password
+
+    Returns:
+        Tuple of (smtplib.SMTP connection, True if it was reused from the pool)
+        (raises on connect/login failure)
+    """
+    key = _smtp_key(config)
+    with _SMTP_POOL_LOCK:
+        server = _SMTP_POOL.get(key)
+    if server is not None:
+        return server, True
+
+    server = smtplib.SMTP(config['smtp_server'], config['smtp_port'], timeout=60)
+    _disable_nagle(server.sock)
+    try:
+        server.starttls()
+        server.login(config['email'], config['password'])
+    except Exception:
+        server.close()
+        raise
+
+    with _SMTP_POOL_LOCK:
+        _SMTP_POOL[key] = server
+    return server, False
+
+
+def _send_pooled(config, msg_bytes):
+    """Send raw message bytes to Flighty over the pooled SMTP session.
+
+    A reused session is not probed with NOOP first (that would cost a round
+    trip per email). If the provider has closed it in the meantime the send
+    raises SMTPServerDisconnected, and we reconnect and resend right away
+    instead of treating it as a failed attempt.
+    """
+    server, reused = _get_smtp(config)
+    try:
+        # Use sendmail with explicit from/to to override headers
+        server.sendmail(config['email'], config['flighty_email'], msg_bytes)
+    except smtplib.SMTPServerDisconnected:
+        if not reused:
+            raise
+        logger.debug("Pooled SMTP session for %s was closed, reconnecting", config['smtp_server'])
+        _discard_smtp(_smtp_key(config))
+        server, _ = _get_smtp(config)
+        server.sendmail(config['email'], config['flighty_email'], msg_bytes)
+
+
+def forward_email(config, msg, from_addr, subject, flight_info=None, on_rate_limit=None,
+                  send_gate=None, report=None, cancelled=None):
     """Forward the original airline email to Flighty.
 
     Sends the original email exactly as received from the airline,
-    just changing the To address to Flighty.
+    just changing the To address to Flighty. Safe to call from several
+    threads at once - each thread uses its own SMTP session.
 
     Args:
         config: Config dict with smtp settings and flighty_email
-        msg: Original email message object to forward
+        msg: Original email to forward - the raw bytes as downloaded
+            (sent untouched) or a parsed message object
         from_addr: Original sender address (for logging)
         subject: Original subject line (for logging)
         flight_info: Extracted flight info dict (for logging only)
+        on_rate_limit: Optional callable invoked when the provider throttles us
+        send_gate: Optional context manager held around every send attempt
+            (limits how many threads talk to the provider at once)
+        report: Optional callable given status text instead of printing it,
+            for callers sending from worker threads
+        cancelled: Optional threading.Event; once set, no further retries
 
     Returns:
         True if sent successfully, False otherwise
     """
-    # Send the original message directly - just need to specify the recipient
-    # The original message headers are preserved
+    def say(text="", end="\n"):
+        if report is None:
+            print(text, end=end, flush=True)
+        else:
+            report(text + end)
+
+    # Raw bytes go out exactly as downloaded; a parsed message is serialized
+    # once with compat32, which keeps the original header lines unchanged
+    try:
+        if isinstance(msg, (bytes, bytearray)):
+            msg_bytes = bytes(msg)
+        else:
+            msg_bytes = msg.as_bytes(policy=compat32)
+    except Exception as e:
+        say()
+        say(f"        FAILED - could not prepare email for sending: {str(e)[:100]}")
+        say(f"        This email will be skipped")
+        return False
 
     # Retry with increasing delays until it works
     retry_delays = [10, 30, 60, 120, 180, 300]  # Up to 5 minutes wait
@@ -283,52 +662,55 @@ def forward_email(config, msg, from_addr, subject, flight_info=None):
 
     for attempt in range(max_attempts):
         try:
-            with smtplib.SMTP(config['smtp_server'], config['smtp_port'], timeout=60) as server:
-                server.starttls()
-                server.login(config['email'], config['password'])
-                # Send the original message directly to Flighty
-                # Use sendmail with explicit from/to to override headers
-                msg_bytes = msg.as_bytes()
-                server.sendmail(config['email'], config['flighty_email'], msg_bytes)
+            # Send the original message directly to Flighty
+            # Reuses the pooled session - only the first send pays for TLS + login
+            with send_gate or contextlib.nullcontext():
+                _send_pooled(config, msg_bytes)
             return True  # Success
         except Exception as e:
+            # Don't reuse a connection that just failed
+            _discard_smtp(_smtp_key(config))
             error_msg = str(e).lower()
 
             # Check if this is a rate limit / connection error (recoverable)
-            is_rate_limit = any(x in error_msg for x in [
-                'rate', 'limit', 'too many', 'try again', 'temporarily',
-                '421', '450', '451', '452', '454', '554',
-                'connection', 'closed', 'reset', 'refused', 'timeout'
-            ])
+            is_rate_limit = _RATE_LIMIT_RE.search(error_msg) is not None
+
+            if is_rate_limit and on_rate_limit:
+                on_rate_limit()
 
             if attempt < max_attempts - 1:
                 wait_time = retry_delays[attempt]
                 wait_mins = wait_time // 60
                 wait_secs = wait_time % 60
 
-                print()  # New line for clarity
+                say()  # New line for clarity
                 if is_rate_limit:
-                    print(f"        BLOCKED by email provider (they limit sending speed)")
-                    print(f"        Error: {str(e)[:100]}")
+                    say(f"        BLOCKED by email provider (they limit sending speed)")
+                    say(f"        Error: {str(e)[:100]}")
                     if wait_mins > 0:
-                        print(f"        Waiting {wait_mins} min {wait_secs} sec then retrying (attempt {attempt + 2} of {max_attempts})...", end="", flush=True)
+                        say(f"        Waiting {wait_mins} min {wait_secs} sec then retrying (attempt {attempt + 2} of {max_attempts})...", end="")
                     else:
-                        print(f"        Waiting {wait_secs} sec then retrying (attempt {attempt + 2} of {max_attempts})...", end="", flush=True)
+                        say(f"        Waiting {wait_secs} sec then retrying (attempt {attempt + 2} of {max_attempts})...", end="")
                 else:
-                    print(f"        Connection error: {str(e)[:100]}")
+                    say(f"        Connection error: {str(e)[:100]}")
                     if wait_mins > 0:
-                        print(f"        Waiting {wait_mins} min {wait_secs} sec then retrying (attempt {attempt + 2} of {max_attempts})...", end="", flush=True)
+                        say(f"        Waiting {wait_mins} min {wait_secs} sec then retrying (attempt {attempt + 2} of {max_attempts})...", end="")
                     else:
-                        print(f"        Waiting {wait_secs} sec then retrying (attempt {attempt + 2} of {max_attempts})...", end="", flush=True)
+                        say(f"        Waiting {wait_secs} sec then retrying (attempt {attempt + 2} of {max_attempts})...", end="")
 
-                time.sleep(wait_time)
-                print(" retrying now...", end="", flush=True)
+                if cancelled is not None:
+                    if cancelled.wait(wait_time):
+                        say(" cancelled")
+                        return False
+                else:
+                    time.sleep(wait_time)
+                say(" retrying now...", end="")
             else:
                 # All retries exhausted
-                print()
-                print(f"        FAILED after {max_attempts} attempts")
-                print(f"        Final error: {str(e)}")
-                print(f"        This email will be skipped - run again later to retry")
+                say()
+                say(f"        FAILED after {max_attempts} attempts")
+                say(f"        Final error: {str(e)}")
+                say(f"        This email will be skipped - run again later to retry")
                 return False
 
     return False
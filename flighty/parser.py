@@ -21,6 +21,16 @@ MARKETING_KEYWORDS = [
     'credit card', 'apply now',
 ]
 
+# Subject words that mark promotional mail
+MARKETING_SUBJECT_KEYWORDS = (
+    'earn', 'bonus', 'points', 'sale', 'offer', 'save',
+    'win', 'deals', 'discount', 'reward',
+)
+
+# Subject words that mark a real booking (shared by the marketing and
+# booking checks so a subject is only scanned for them once)
+CONFIRMATION_SUBJECT_HINTS = ('confirmation', 'itinerary')
+
 # Words that look like confirmation codes but aren't
 EXCLUDED_CODES = {
     'FLIGHT', 'TRAVEL', 'TICKET', 'BOOKING', 'CONFIRM', 'NUMBER',
@@ -82,28 +92,33 @@ def strip_html(html: str) -> str:
     return text.strip()
 
 
-def is_marketing_email(text: str, subject: str) -> bool:
-    """Check if email is marketing/promotional."""
-    combined = (text + " " + subject).lower()
-
+def _is_marketing(text_lower: str, subject_lower: str, confirmation_hint: bool) -> bool:
+    """is_marketing_email on already-lowercased text and subject."""
     # Check for marketing keywords
-    marketing_count = sum(1 for kw in MARKETING_KEYWORDS if kw in combined)
+    marketing_count = sum(
+        1 for kw in MARKETING_KEYWORDS if kw in text_lower or kw in subject_lower
+    )
     if marketing_count >= 2:
         return True
 
     # Marketing subjects
-    marketing_subjects = [
-        'earn', 'bonus', 'points', 'sale', 'offer', 'save',
-        'win', 'deals', 'discount', 'reward',
-    ]
-    subject_lower = subject.lower()
-    if any(kw in subject_lower for kw in marketing_subjects):
-        if 'confirmation' not in subject_lower and 'itinerary' not in subject_lower:
-            return True
+    if not confirmation_hint and any(kw in subject_lower for kw in MARKETING_SUBJECT_KEYWORDS):
+        return True
 
     return False
 
 
+def _has_confirmation_hint(subject_lower: str) -> bool:
+    """Check a lowercased subject for booking words like 'confirmation'."""
+    return any(hint in subject_lower for hint in CONFIRMATION_SUBJECT_HINTS)
+
+
+def is_marketing_email(text: str, subject: str) -> bool:
+    """Check if email is marketing/promotional."""
+    subject_lower = subject.lower()
+    return _is_marketing(text.lower(), subject_lower, _has_confirmation_hint(subject_lower))
+
+
 def get_email_type(text: str, subject: str, has_confirmation: bool = False) -> str:
     """Classify email type."""
     subject_lower = subject.lower()
@@ -115,12 +130,14 @@ def get_email_type(text: str, subject: str, has_confirmation: bool = False) -> s
     if 'has been cancelled' in text_lower:
         return 'cancellation'
 
+    confirmation_hint = _has_confirmation_hint(subject_lower)
+
     # Check for marketing
-    if is_marketing_email(text, subject):
+    if _is_marketing(text_lower, subject_lower, confirmation_hint):
         return 'marketing'
 
     # Check for booking confirmation
-    if 'confirmation' in subject_lower or 'itinerary' in subject_lower:
+    if confirmation_hint:
         return 'booking'
     if has_confirmation:
         return 'booking'
@@ -4,79 +4,95 @@ PDF Report Generation for Flight Summary.
 Creates a PDF summary of flights grouped by year, month, and day.
 """
 
+import functools
+import itertools
 import re
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
 
 from .deps import ensure_reportlab
 
-# Auto-install reportlab if needed
-HAS_REPORTLAB = ensure_reportlab()
+# Whether reportlab can be used - resolved (and auto-installed if needed) the
+# first time a PDF is generated, so runs that never build a PDF don't pay for it
+HAS_REPORTLAB = None
 
-if HAS_REPORTLAB:
-    from reportlab.lib import colors
-    from reportlab.lib.pagesizes import letter
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+
+def _reportlab_available():
+    """Check for reportlab once per process, installing it if missing."""
+    global HAS_REPORTLAB
+    if HAS_REPORTLAB is None:
+        HAS_REPORTLAB = ensure_reportlab()
+    return HAS_REPORTLAB
 
 
+MONTH_NAMES = ('January', 'February', 'March', 'April', 'May', 'June',
+               'July', 'August', 'September', 'October', 'November', 'December')
+MONTH_ORDER = {name: i + 1 for i, name in enumerate(MONTH_NAMES)}
+
+# Date formats recognised by parse_date_components, compiled once
+_ISO_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})')
+_MONTH_DAY_YEAR_RE = re.compile(r'(\w+)\s+(\d{1,2}),?\s*(\d{4})')
+_DAY_MONTH_YEAR_RE = re.compile(r'(\d{1,2})\s+(\w+)\s+(\d{4})')
+_MONTH_YEAR_RE = re.compile(r'(\w+)\s+(\d{4})')
+
+
+@functools.lru_cache(maxsize=4096)
 def parse_date_components(date_str):
     """Extract year, month, day from date string like 'April 28, 2025' or ISO date.
 
+    Results are cached - legs of the same trip usually share a date string.
+
     Returns:
         Tuple of (year, month_num, month_name, day)
     """
     if not date_str:
         return (9999, 0, "Unknown", 0)
 
-    month_names = ['January', 'February', 'March', 'April', 'May', 'June',
-                   'July', 'August', 'September', 'October', 'November', 'December']
-    month_order = {name: i+1 for i, name in enumerate(month_names)}
-
     # Try ISO format first (YYYY-MM-DD)
-    iso_match = re.match(r'(\d{4})-(\d{2})-(\d{2})', date_str)
+    iso_match = _ISO_RE.match(date_str)
     if iso_match:
         year = int(iso_match.group(1))
         month_num = int(iso_match.group(2))
         day = int(iso_match.group(3))
-        month_name = month_names[month_num - 1] if 1 <= month_num <= 12 else 'Unknown'
+        month_name = MONTH_NAMES[month_num - 1] if 1 <= month_num <= 12 else 'Unknown'
         return (year, month_num, month_name, day)
 
     # Try "Month DD, YYYY" format
-    match = re.match(r'(\w+)\s+(\d{1,2}),?\s*(\d{4})', date_str)
+    match = _MONTH_DAY_YEAR_RE.match(date_str)
     if match:
         month_name = match.group(1)
         day = int(match.group(2))
         year = int(match.group(3))
-        month_num = month_order.get(month_name, 0)
+        month_num = MONTH_ORDER.get(month_name, 0)
         return (year, month_num, month_name, day)
 
     # Try "DD Mon YYYY" format (like "03 Dec 2015")
-    match = re.match(r'(\d{1,2})\s+(\w+)\s+(\d{4})', date_str)
+    match = _DAY_MONTH_YEAR_RE.match(date_str)
     if match:
         day = int(match.group(1))
         month_name = match.group(2)
         year = int(match.group(3))
         # Handle abbreviated month names
-        for full_name in month_names:
+        for full_name in MONTH_NAMES:
             if full_name.lower().startswith(month_name.lower()[:3]):
                 month_name = full_name
                 break
-        month_num = month_order.get(month_name, 0)
+        month_num = MONTH_ORDER.get(month_name, 0)
         return (year, month_num, month_name, day)
 
     # Try "Month YYYY" format
-    match = re.match(r'(\w+)\s+(\d{4})', date_str)
+    match = _MONTH_YEAR_RE.match(date_str)
     if match:
         month_name = match.group(1)
         year = int(match.group(2))
-        month_num = month_order.get(month_name, 0)
+        month_num = MONTH_ORDER.get(month_name, 0)
         return (year, month_num, month_name, 0)
 
     return (9999, 0, "Unknown", 0)
 
 
+@functools.lru_cache(maxsize=4096)
 def parse_month_year(date_str):
     """Extract month and year from date string (backwards compatibility)."""
     year, month_num, month_name, _ = parse_date_components(date_str)
@@ -94,9 +110,6 @@ def group_flights_by_year_month(flights):
     """
     from collections import defaultdict
 
-    month_names = ['January', 'February', 'March', 'April', 'May', 'June',
-                   'July', 'August', 'September', 'October', 'November', 'December']
-
     flights_by_year = defaultdict(lambda: defaultdict(list))
 
     for flight in flights:
@@ -142,6 +155,33 @@ def group_flights_by_year_month(flights):
     return result
 
 
+def _month_key(flight):
+    """Return the (year, month_num, month_name) bucket for a flight."""
+    flight_info = flight.get("flight_info") or {}
+
+    # Try ISO date first, then display dates
+    iso_date = flight_info.get("iso_date")
+    dates = flight_info.get("dates") or []
+    date_str = iso_date or (dates[0] if dates else "")
+
+    month_name, year, month_num = parse_month_year(date_str)
+    return (year, month_num, month_name)
+
+
+def iter_flights_by_month(flights):
+    """Yield flights month by month in a single sort + groupby pass.
+
+    Args:
+        flights: List of flight dicts with flight_info containing dates
+
+    Yields:
+        Tuples of ((year, month_num, month_name), list of flights), in date order
+    """
+    keyed = sorted(((_month_key(flight), flight) for flight in flights), key=itemgetter(0))
+    for key, group in itertools.groupby(keyed, key=itemgetter(0)):
+        yield key, [flight for _, flight in group]
+
+
 def group_flights_by_month(flights):
     """Group flights by month-year (backwards compatibility).
 
@@ -151,23 +191,32 @@ def group_flights_by_month(flights):
     Returns:
         Dict of (year, month_num, month_name) -> list of flights, sorted
     """
-    from collections import defaultdict
+    return dict(iter_flights_by_month(flights))
 
-    flights_by_month = defaultdict(list)
 
-    for flight in flights:
-        flight_info = flight.get("flight_info") or {}
-
-        # Try ISO date first, then display dates
-        iso_date = flight_info.get("iso_date")
-        dates = flight_info.get("dates") or []
-        date_str = iso_date or (dates[0] if dates else "")
-
-        month_name, year, month_num = parse_month_year(date_str)
-        key = (year, month_num, month_name)
-        flights_by_month[key].append(flight)
-
-    return dict(sorted(flights_by_month.items()))
+@functools.lru_cache(maxsize=None)
+def _flight_table_style():
+    """Build the shared month table style once (clean minimal look)."""
+    from reportlab.lib import colors
+    from reportlab.platypus import TableStyle
+
+    return TableStyle([
+        # Header row
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 9),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#666666')),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+        ('LINEBELOW', (0, 0), (-1, 0), 1, colors.HexColor('#cccccc')),
+        # Data rows
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor('#333333')),
+        ('TOPPADDING', (0, 1), (-1, -1), 4),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        # Subtle row lines
+        ('LINEBELOW', (0, 1), (-1, -2), 0.5, colors.HexColor('#eeeeee')),
+    ])
 
 
 def generate_pdf_report(flights, output_path, title="Flight Summary"):
@@ -190,11 +239,17 @@ def generate_pdf_report(flights, output_path, title="Flight Summary"):
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    if not HAS_REPORTLAB:
+    if not _reportlab_available():
         # Fall back to text report
         print("      (reportlab not available, generating text file instead)")
         return generate_text_report(flights, output_path.with_suffix('.txt'), title)
 
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, LongTable, PageBreak
+
     # Group flights by year and month
     flights_by_year = group_flights_by_year_month(flights)
 
@@ -285,10 +340,11 @@ def generate_pdf_report(flights, output_path, title="Flight Summary"):
             # Month header
             story.append(Paragraph(f"{month_name}", month_style))
 
-            # Build table data
-            table_data = [['Date', 'Confirmation', 'Flight', 'Route']]
+            # Build table data - header row plus one pre-allocated row per flight
+            table_data = [None] * (len(month_flights) + 1)
+            table_data[0] = ['Date', 'Confirmation', 'Flight', 'Route']
 
-            for flight in month_flights:
+            for row, flight in enumerate(month_flights, start=1):
                 flight_info = flight.get("flight_info") or {}
                 conf = flight.get("confirmation") or "------"
 
@@ -329,27 +385,11 @@ def generate_pdf_report(flights, output_path, title="Flight Summary"):
                 else:
                     display_date = date_str[:15] if date_str else ""
 
-                table_data.append([display_date, conf, flight_num, route])
-
-            # Create table - clean minimal style
-            table = Table(table_data, colWidths=[0.8*inch, 1.0*inch, 0.7*inch, 2.5*inch])
-            table.setStyle(TableStyle([
-                # Header row
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 9),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#666666')),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-                ('LINEBELOW', (0, 0), (-1, 0), 1, colors.HexColor('#cccccc')),
-                # Data rows
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor('#333333')),
-                ('TOPPADDING', (0, 1), (-1, -1), 4),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                # Subtle row lines
-                ('LINEBELOW', (0, 1), (-1, -2), 0.5, colors.HexColor('#eeeeee')),
-            ]))
+                table_data[row] = [display_date, conf, flight_num, route]
+
+            # Create table - LongTable splits across pages and repeats the header
+            table = LongTable(table_data, colWidths=[0.8*inch, 1.0*inch, 0.7*inch, 2.5*inch], repeatRows=1)
+            table.setStyle(_flight_table_style())
 
             story.append(table)
             story.append(Spacer(1, 15))
@@ -364,38 +404,23 @@ def generate_pdf_report(flights, output_path, title="Flight Summary"):
         return generate_text_report(flights, output_path.with_suffix('.txt'), title)
 
 
-def generate_text_report(flights, output_path, title="Flight Summary"):
-    """Generate a plain text report of flights grouped by month.
-
-    Args:
-        flights: List of flight dicts
-        output_path: Path to save the text file
-        title: Title for the report
-
-    Returns:
-        Path to the generated file or None on failure
-    """
+def _iter_text_report_lines(flights, title):
+    """Yield the lines of the plain text report, one flight at a time."""
     from .airports import get_airport_display, VALID_AIRPORT_CODES
 
-    output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    flights_by_month = group_flights_by_month(flights)
-
-    lines = []
-    lines.append("=" * 70)
-    lines.append(f"  {title}")
-    lines.append("=" * 70)
-    lines.append(f"  Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}")
-    lines.append(f"  Total Flights: {len(flights)}")
-    lines.append("")
+    yield "=" * 70
+    yield f"  {title}"
+    yield "=" * 70
+    yield f"  Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}"
+    yield f"  Total Flights: {len(flights)}"
+    yield ""
 
-    for (year, month_num, month_name), month_flights in flights_by_month.items():
-        lines.append("")
-        lines.append("=" * 70)
-        lines.append(f"  {month_name.upper()} {year}  ({len(month_flights)} flights)")
-        lines.append("=" * 70)
-        lines.append("")
+    for (year, month_num, month_name), month_flights in iter_flights_by_month(flights):
+        yield ""
+        yield "=" * 70
+        yield f"  {month_name.upper()} {year}  ({len(month_flights)} flights)"
+        yield "=" * 70
+        yield ""
 
         for flight in month_flights:
             flight_info = flight.get("flight_info") or {}
@@ -424,17 +449,33 @@ def generate_text_report(flights, output_path, title="Flight Summary"):
             dates = flight_info.get("dates") or []
             date_str = dates[0] if dates else ""
 
-            lines.append(f"  {conf:<10} {flight_num:<8} {route}")
+            yield f"  {conf:<10} {flight_num:<8} {route}"
             if date_str:
-                lines.append(f"             Date: {date_str}")
-            lines.append("")
+                yield f"             Date: {date_str}"
+            yield ""
+
+    yield ""
+    yield "=" * 70
 
-    lines.append("")
-    lines.append("=" * 70)
+
+def generate_text_report(flights, output_path, title="Flight Summary"):
+    """Generate a plain text report of flights grouped by month.
+
+    Args:
+        flights: List of flight dicts
+        output_path: Path to save the text file
+        title: Title for the report
+
+    Returns:
+        Path to the generated file or None on failure
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
 
     try:
+        # Stream lines straight to disk instead of joining one big string
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
+            f.writelines(line + '\n' for line in _iter_text_report_lines(flights, title))
         return output_path
     except Exception as e:
         print(f"      Error generating report: {e}")
@@ -5,14 +5,14 @@ Scans email folders for flight confirmation emails using IMAP.
 Groups by unique segment key, keeps latest email per segment.
 """
 
-import email
 import hashlib
 import pickle
-import re
+import threading
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from . import __version__
 from .airports import VALID_AIRPORT_CODES
 from .airlines import is_flight_email
 from .parser import (
@@ -21,7 +21,15 @@ from .parser import (
     get_email_type,
     format_date_display
 )
-from .email_handler import decode_header_value, get_email_body, parse_email_date
+from .config import load_scan_state, save_scan_state
+from .email_handler import (
+    fetch_messages_bulk,
+    get_email_body,
+    get_header,
+    parse_email_date,
+    parse_full,
+    parse_headers_only
+)
 
 # Rate limiting settings
 IMAP_BATCH_DELAY = 0.2
@@ -29,6 +37,14 @@ IMAP_SEARCH_DELAY = 0.1
 IMAP_RETRY_DELAY = 5
 IMAP_MAX_RETRIES = 3
 
+# FETCH items: headers for triage, full message only for candidates. Both use
+# BODY.PEEK so scanning never marks messages as read.
+HEADER_FETCH_PARTS = '(BODY.PEEK[HEADER.FIELDS (FROM SUBJECT DATE)])'
+MESSAGE_FETCH_PARTS = '(BODY.PEEK[])'
+
+# Folders may be scanned in parallel; serializes scan_state.json updates
+_SCAN_STATE_LOCK = threading.Lock()
+
 # Cache settings
 CACHE_DIR = Path(__file__).parent.parent / ".email_cache"
 CACHE_FILE = CACHE_DIR / "emails.pkl"
@@ -97,17 +113,24 @@ SUBJECT_KEYWORDS = [
 
 
 def _imap_search_with_retry(mail, criteria, max_retries=IMAP_MAX_RETRIES):
-    """Execute IMAP search with retry logic using UIDs."""
+    """Execute IMAP search with retry logic using UIDs.
+
+    Returns:
+        Set of matching UIDs, or None if the search failed (so callers can
+        tell a failed search from one with no results)
+    """
     for attempt in range(max_retries):
         try:
             result, data = mail.uid('search', None, criteria)
-            if result == 'OK' and data[0]:
+            if result != 'OK':
+                return None
+            if data[0]:
                 return set(data[0].split())
             return set()
         except Exception:
             if attempt < max_retries - 1:
                 time.sleep(IMAP_RETRY_DELAY)
-    return set()
+    return None
 
 
 def _build_or_query(terms, field="FROM"):
@@ -122,29 +145,48 @@ def _build_or_query(terms, field="FROM"):
     return query
 
 
-def _search_individual(mail, since_date, terms, field, all_ids):
-    """Fall back to individual searches when OR queries fail."""
+def _search_individual(mail, scope, terms, field, all_ids):
+    """Fall back to individual searches when OR queries fail.
+
+    Returns:
+        Tuple: (number of new UIDs found, True if every search succeeded)
+    """
     found = 0
+    complete = True
     for term in terms:
         try:
-            criteria = f'(SINCE {since_date} ({field} "{term}"))'
+            criteria = f'({scope} ({field} "{term}"))'
             ids = _imap_search_with_retry(mail, criteria)
-            if ids:
+            if ids is None:
+                complete = False
+            elif ids:
                 new_ids = ids - all_ids
                 if new_ids:
                     all_ids.update(new_ids)
                     found += len(new_ids)
             time.sleep(IMAP_SEARCH_DELAY)
         except Exception:
-            pass
-    return found
+            complete = False
+    return found, complete
 
 
-def _optimized_search(mail, since_date, verbose=True):
-    """Execute optimized searches using combined OR queries with fallback."""
+def _optimized_search(mail, since_date, verbose=True, min_uid=None):
+    """Execute optimized searches using combined OR queries with fallback.
+
+    With min_uid set, the server only returns messages from that UID up.
+
+    Returns:
+        Tuple: (UID set, matches per search group, True if the per-term
+        fallback was used, True if no search group failed)
+    """
     all_ids = set()
     sources = {}
     using_fallback = False
+    complete = True
+
+    scope = f'SINCE {since_date}'
+    if min_uid:
+        scope += f' UID {min_uid}:*'
 
     search_groups = [
         ("US Airlines", AIRLINE_DOMAINS[0:12], "FROM"),
@@ -172,7 +214,7 @@ def _optimized_search(mail, since_date, verbose=True):
         or_query = _build_or_query(terms, field)
 
         if or_query:
-            criteria = f'(SINCE {since_date} {or_query})'
+            criteria = f'({scope} {or_query})'
             try:
                 ids = _imap_search_with_retry(mail, criteria)
                 if ids:
@@ -181,12 +223,15 @@ def _optimized_search(mail, since_date, verbose=True):
                         all_ids.update(new_ids)
                         found_in_group = len(new_ids)
             except Exception:
-                ids = set()
+                ids = None
 
             if not ids and len(terms) > 1:
                 if not using_fallback:
                     using_fallback = True
-                found_in_group = _search_individual(mail, since_date, terms, field, all_ids)
+                found_in_group, group_complete = _search_individual(mail, scope, terms, field, all_ids)
+                complete = complete and group_complete
+            elif ids is None:
+                complete = False
 
         if found_in_group > 0:
             sources[group_name] = found_in_group
@@ -199,77 +244,90 @@ def _optimized_search(mail, since_date, verbose=True):
     if verbose:
         print()
 
-    return all_ids, sources, using_fallback
+    if min_uid:
+        # "UID n:*" always matches the newest message, even below n
+        all_ids = {uid for uid in all_ids if int(uid) >= min_uid}
 
+    return all_ids, sources, using_fallback, complete
 
-def _fetch_headers_batch(mail, email_ids, batch_size=50, verbose=True):
-    """Fetch email headers in batches for speed."""
-    results = []
-    total = len(email_ids)
-    processed = 0
 
-    for i in range(0, len(email_ids), batch_size):
-        batch = email_ids[i:i + batch_size]
-        id_str = b','.join(batch)
+def _fetch_headers_batch(mail, email_ids, batch_size=200, verbose=True):
+    """Fetch From/Subject/Date headers with one UID FETCH per batch of emails.
 
+    Returns:
+        List of (uid, headers dict) for every email that was fetched.
+        Headers are None when they were fetched but could not be parsed.
+    """
+    raw_headers = fetch_messages_bulk(
+        mail,
+        email_ids,
+        parts=HEADER_FETCH_PARTS,
+        batch_size=batch_size,
+        max_retries=IMAP_MAX_RETRIES,
+        retry_delay=IMAP_RETRY_DELAY,
+        verbose=verbose,
+        progress_label='Checking'
+    )
+
+    results = []
+    for uid, header_data in raw_headers.items():
+        # Headers are parsed lazily on access, so a malformed one raises
+        # from get_header - skip that email rather than the whole scan
         try:
-            result, data = mail.uid('fetch', id_str, '(BODY.PEEK[HEADER.FIELDS (FROM SUBJECT DATE)])')
-            if result != 'OK':
-                processed += len(batch)
-                continue
+            header_msg = parse_headers_only(header_data)
+            hdr = {
+                'from': get_header(header_msg, 'From'),
+                'subject': get_header(header_msg, 'Subject'),
+                'date': get_header(header_msg, 'Date')
+            }
+        except Exception:
+            hdr = None
+        results.append((uid, hdr))
 
-            for item in data:
-                if isinstance(item, tuple) and len(item) >= 2:
-                    info = item[0]
-                    if isinstance(info, bytes):
-                        info = info.decode('ascii', errors='ignore')
-
-                    uid_match = re.search(r'UID\s+(\d+)', info)
-                    if not uid_match:
-                        continue
-
-                    uid = uid_match.group(1).encode('ascii')
-                    header_data = item[1]
-
-                    if header_data:
-                        try:
-                            header_msg = email.message_from_bytes(header_data)
-                            results.append((uid, {
-                                'from': decode_header_value(header_msg.get('From', '')),
-                                'subject': decode_header_value(header_msg.get('Subject', '')),
-                                'date': header_msg.get('Date', '')
-                            }))
-                        except Exception:
-                            pass
-
-            processed += len(batch)
-            if verbose:
-                print(f"\r      Checking... {processed}/{total}" + " " * 10, end="", flush=True)
+    return results
 
-        except Exception:
-            for eid in batch:
-                try:
-                    result, msg_data = mail.uid('fetch', eid, '(BODY.PEEK[HEADER.FIELDS (FROM SUBJECT DATE)])')
-                    if result == 'OK' and msg_data and msg_data[0]:
-                        header_data = msg_data[0][1]
-                        if header_data:
-                            header_msg = email.message_from_bytes(header_data)
-                            results.append((eid, {
-                                'from': decode_header_value(header_msg.get('From', '')),
-                                'subject': decode_header_value(header_msg.get('Subject', '')),
-                                'date': header_msg.get('Date', '')
-                            }))
-                    time.sleep(IMAP_SEARCH_DELAY)
-                except Exception:
-                    pass
-
-            processed += len(batch)
-            if verbose:
-                print(f"\r      Checking... {processed}/{total}" + " " * 10, end="", flush=True)
 
-        time.sleep(IMAP_BATCH_DELAY)
+def _folder_uidvalidity(mail):
+    """Return the selected folder's UIDVALIDITY, or None if not reported."""
+    try:
+        _, data = mail.response('UIDVALIDITY')
+    except Exception:
+        return None
+    if data and data[0]:
+        value = data[0]
+        return value.decode('ascii', errors='ignore') if isinstance(value, bytes) else str(value)
+    return None
 
-    return results
+
+def _uids_in_window(mail, since_date, uids, batch_size=200):
+    """Return which of the given UIDs still exist and fall inside the date window.
+
+    Returns None if any of the searches failed.
+    """
+    found = set()
+    for i in range(0, len(uids), batch_size):
+        id_set = ','.join(uids[i:i + batch_size])
+        ids = _imap_search_with_retry(mail, f'(SINCE {since_date} UID {id_set})')
+        if ids is None:
+            return None
+        found |= ids
+    return {uid.decode('ascii') for uid in found}
+
+
+def _usable_scan_state(entry, uidvalidity, since_iso):
+    """Return the folder's saved scan state if it can seed an incremental scan.
+
+    The state is only trusted when the folder's UIDs are unchanged, it was
+    written by this version (search terms and filters may differ between
+    versions), and it covers at least the requested date window.
+    """
+    if not entry or not uidvalidity:
+        return None
+    if entry.get('uidvalidity') != uidvalidity or entry.get('version') != __version__:
+        return None
+    if entry.get('since', '9999-99-99') > since_iso:
+        return None
+    return entry
 
 
 def save_email_cache(flight_candidates, raw_emails, related_emails):
@@ -336,12 +394,28 @@ def create_segment_key(confirmation: str, origin: str, dest: str, date: str, fli
         return f"ROUTE|{origin}|{dest}|{date}"
 
 
-def scan_for_flights(mail, config, folder, processed, use_cache=False, save_cache=False):
+def scan_for_flights(mail, config, folder, processed, use_cache=False, save_cache=False, since=None,
+                     report=None):
     """Scan folder and collect all flight emails.
 
+    Args:
+        since: Start of the search window (datetime). Computed from
+            config['days_back'] if not given; run() passes one value so
+            every folder searches the same window.
+        report: Optional callable given the folder's result lines instead
+            of printing them. Step-by-step progress is left out, so folders
+            scanned in parallel each show one summary line.
+
     Returns:
         Tuple: (flights_found dict, skipped_confirmations list)
     """
+    verbose = report is None
+    outcome = print if verbose else report
+
+    def say(text=""):
+        if verbose:
+            print(text)
+
     flights_found = {}
     skipped_confirmations = []
     already_processed = processed.get("confirmations", {})
@@ -354,52 +428,86 @@ def scan_for_flights(mail, config, folder, processed, use_cache=False, save_cach
     cached_raw_emails = None
 
     if use_cache:
-        print()
-        print("  [CACHE MODE] Loading emails from cache...")
+        say()
+        say("  [CACHE MODE] Loading emails from cache...")
         cached_flight_candidates, cached_raw_emails, _ = load_email_cache()
         if cached_flight_candidates is None:
-            print("      No cache found. Run with --save-cache first.")
+            say("      No cache found. Run with --save-cache first.")
             return flights_found, skipped_confirmations
-        print(f"      Loaded {len(cached_flight_candidates)} candidates from cache")
+        say(f"      Loaded {len(cached_flight_candidates)} candidates from cache")
         flight_candidates = cached_flight_candidates
     else:
         # Normal IMAP mode
         try:
             result, _ = mail.select(folder)
             if result != 'OK':
-                print(f"    Could not open folder: {folder}")
+                outcome(f"    Could not open folder: {folder}")
                 return flights_found, skipped_confirmations
         except Exception:
-            print(f"    Could not open folder: {folder}")
+            outcome(f"    Could not open folder: {folder}")
             return flights_found, skipped_confirmations
 
-        since_date = (datetime.now() - timedelta(days=config['days_back'])).strftime("%d-%b-%Y")
+        if since is None:
+            since = datetime.now() - timedelta(days=config['days_back'])
+        since_date = since.strftime("%d-%b-%Y")
+        since_iso = since.date().isoformat()
+
+        # Incremental scan: if this folder was scanned before, only search mail
+        # that arrived after it and reuse the flight candidates found last time
+        state_key = f"{config['email']}|{config['imap_server']}|{folder}"
+        uidvalidity = _folder_uidvalidity(mail)
+        prior = None
+        if config.get('incremental_scan', True):
+            with _SCAN_STATE_LOCK:
+                saved_state = load_scan_state().get(state_key)
+            prior = _usable_scan_state(saved_state, uidvalidity, since_iso)
+        min_uid = prior['last_uid'] + 1 if prior else None
 
         # Phase 1: Search for flight emails
-        print()
-        print(f"  [1/3] Searching for flight emails (past {config['days_back']} days)...")
+        say()
+        say(f"  [1/3] Searching for flight emails (past {config['days_back']} days)...")
         search_start = time.time()
-        all_email_ids, sources, used_fallback = _optimized_search(mail, since_date, verbose=True)
+        all_email_ids, sources, used_fallback, search_complete = _optimized_search(
+            mail, since_date, verbose=verbose, min_uid=min_uid
+        )
         email_ids = list(all_email_ids)
         total = len(email_ids)
+
+        remembered = {}
+        if prior and prior.get('candidates'):
+            live = _uids_in_window(mail, since_date, list(prior['candidates']))
+            if live is None:
+                search_complete = False
+            else:
+                remembered = {uid: hdr for uid, hdr in prior['candidates'].items() if uid in live}
         search_time = time.time() - search_start
 
+        found_label = "new emails since last scan" if prior else "potential emails"
         if used_fallback:
-            print(f"      Found {total} potential emails ({search_time:.1f}s) [slow search mode]")
+            say(f"      Found {total} {found_label} ({search_time:.1f}s) [slow search mode]")
         else:
-            print(f"      Found {total} potential emails ({search_time:.1f}s)")
+            say(f"      Found {total} {found_label} ({search_time:.1f}s)")
+        if not search_complete:
+            say("      Some searches failed - they will be retried next run")
 
-        if total == 0:
-            print("      No emails found from airlines or booking sites.")
+        if total == 0 and not remembered:
+            say("      No emails found from airlines or booking sites.")
             return flights_found, skipped_confirmations
 
         # Phase 2: Check headers to filter flight confirmations
-        print(f"  [2/3] Filtering flight confirmations...")
+        say(f"  [2/3] Filtering flight confirmations...")
         scan_start = time.time()
         flight_candidates = []
-        headers = _fetch_headers_batch(mail, email_ids, verbose=True)
+        headers = _fetch_headers_batch(
+            mail,
+            email_ids,
+            batch_size=config.get('header_batch_size', 200),
+            verbose=verbose
+        )
 
         for email_id, hdr in headers:
+            if hdr is None:
+                continue
             is_flight, airline = is_flight_email(hdr['from'], hdr['subject'])
             if is_flight:
                 flight_candidates.append({
@@ -410,18 +518,62 @@ def scan_for_flights(mail, config, folder, processed, use_cache=False, save_cach
                     'airline': airline
                 })
 
+        # Emails already triaged on an earlier run
+        for uid, hdr in remembered.items():
+            flight_candidates.append({
+                'email_id': uid.encode('ascii'),
+                'from_addr': hdr['from'],
+                'subject': hdr['subject'],
+                'date_str': hdr['date'],
+                'airline': hdr['airline']
+            })
+
+        # After a failed search, keep the saved state as it was: mail the
+        # search missed must not end up below the mark
+        if uidvalidity and search_complete:
+            # Advance past every UID whose headers were checked (even if they
+            # couldn't be parsed), but not past one whose fetch failed so it
+            # is searched again next time
+            checked = {uid for uid, _ in headers}
+            missing = [int(uid) for uid in email_ids if uid not in checked]
+            last_uid = max([int(uid) for uid in checked] + [min_uid - 1 if min_uid else 0])
+            if missing:
+                last_uid = min(last_uid, min(missing) - 1)
+            folder_state = {
+                'uidvalidity': uidvalidity,
+                'version': __version__,
+                'since': since_iso,
+                'last_uid': last_uid,
+                'candidates': {
+                    c['email_id'].decode('ascii'): {
+                        'from': c['from_addr'],
+                        'subject': c['subject'],
+                        'date': c['date_str'],
+                        'airline': c['airline']
+                    }
+                    for c in flight_candidates
+                    if int(c['email_id']) <= last_uid
+                }
+            }
+            # Re-read under the lock so parallel folder scans don't drop
+            # each other's entries
+            with _SCAN_STATE_LOCK:
+                scan_state = load_scan_state()
+                scan_state[state_key] = folder_state
+                save_scan_state(scan_state)
+
         header_time = time.time() - scan_start
-        print(f"      {len(flight_candidates)} confirmations identified ({header_time:.1f}s)")
+        say(f"      {len(flight_candidates)} confirmations identified ({header_time:.1f}s)")
 
     if not flight_candidates:
-        print("      No flight confirmations found in this folder.")
+        say("      No flight confirmations found in this folder.")
         return flights_found, skipped_confirmations
 
     # Phase 3: Download and analyze full emails
     if use_cache:
-        print(f"  [CACHE MODE] Processing {len(flight_candidates)} cached emails...")
+        say(f"  [CACHE MODE] Processing {len(flight_candidates)} cached emails...")
     else:
-        print(f"  [3/3] Downloading and analyzing {len(flight_candidates)} emails...")
+        say(f"  [3/3] Downloading and analyzing {len(flight_candidates)} emails...")
 
     download_start = time.time()
     flight_count = 0
@@ -431,11 +583,24 @@ def scan_for_flights(mail, config, folder, processed, use_cache=False, save_cach
     marketing_filtered = 0
     cancelled_codes = set()
 
+    # Download all candidate emails up front in batched UID FETCH commands
+    raw_by_uid = {}
+    if not use_cache:
+        raw_by_uid = fetch_messages_bulk(
+            mail,
+            [c['email_id'] for c in flight_candidates],
+            parts=MESSAGE_FETCH_PARTS,
+            batch_size=config.get('fetch_batch_size', 100),
+            max_retries=IMAP_MAX_RETRIES,
+            retry_delay=IMAP_RETRY_DELAY,
+            verbose=verbose
+        )
+
     for candidate in flight_candidates:
         download_count += 1
         email_id = candidate['email_id']
 
-        if download_count % 5 == 0 or download_count == len(flight_candidates):
+        if verbose and (download_count % 5 == 0 or download_count == len(flight_candidates)):
             print(f"\r      Processing... {download_count}/{len(flight_candidates)}" + " " * 10, end="", flush=True)
 
         # Get raw email
@@ -447,30 +612,20 @@ def scan_for_flights(mail, config, folder, processed, use_cache=False, save_cach
         elif use_cache:
             continue
         else:
-            for attempt in range(IMAP_MAX_RETRIES):
-                try:
-                    result, msg_data = mail.uid('fetch', email_id, '(RFC822)')
-                    time.sleep(IMAP_SEARCH_DELAY)
-                    if result == 'OK' and msg_data and msg_data[0]:
-                        raw_email = msg_data[0][1]
-                        if raw_email:
-                            if save_cache:
-                                candidate['raw_bytes'] = raw_email
-                            break
-                except Exception:
-                    if attempt < IMAP_MAX_RETRIES - 1:
-                        time.sleep(IMAP_RETRY_DELAY)
-                    else:
-                        failed_downloads += 1
+            raw_email = raw_by_uid.pop(email_id, None)
+            if not raw_email:
+                failed_downloads += 1
+            elif save_cache:
+                candidate['raw_bytes'] = raw_email
 
         if not raw_email:
             continue
 
         try:
-            msg = email.message_from_bytes(raw_email)
-            from_addr = decode_header_value(msg.get('From', ''))
-            subject = decode_header_value(msg.get('Subject', ''))
-            date_str = msg.get('Date', '')
+            msg = parse_full(raw_email)
+            from_addr = get_header(msg, 'From')
+            subject = get_header(msg, 'Subject')
+            date_str = get_header(msg, 'Date')
 
             # Re-detect airline
             is_flight, airline = is_flight_email(from_addr, subject)
@@ -517,7 +672,8 @@ def scan_for_flights(mail, config, folder, processed, use_cache=False, save_cach
             # Store flight data with segments
             flight_data = {
                 "email_id": email_id,
-                "msg": msg,
+                # Forwarded as-is; the parsed tree isn't kept once extracted
+                "raw_email": raw_email,
                 "from_addr": from_addr,
                 "subject": subject,
                 "email_date": email_date,
@@ -548,7 +704,7 @@ def scan_for_flights(mail, config, folder, processed, use_cache=False, save_cach
             failed_downloads += 1
             continue
 
-    print()
+    say()
 
     # Save cache if requested
     if save_cache:
@@ -577,7 +733,7 @@ def scan_for_flights(mail, config, folder, processed, use_cache=False, save_cach
         summary_parts.append(f"{failed_downloads} failed")
     if use_cache:
         summary_parts.append("from cache")
-    print(f"  ✓ {folder}: {', '.join(summary_parts)} ({total_time:.1f}s)")
+    outcome(f"  ✓ {folder}: {', '.join(summary_parts)} ({total_time:.1f}s)")
 
     return flights_found, skipped_confirmations
 
@@ -15,7 +15,6 @@ Usage:
 """
 
 import poplib
-import email
 import json
 import re
 import sys
@@ -32,7 +31,7 @@ RESULTS_FILE = SCRIPT_DIR / ".pop3_scan_results.pkl"
 # Import flight detection modules
 from flighty.airlines import is_flight_email
 from flighty.parser import extract_flight_info
-from flighty.email_handler import decode_header_value, get_email_body
+from flighty.email_handler import get_email_body, get_header, parse_full, parse_headers_only
 from flighty.pdf_report import generate_pdf_report
 
 # Comprehensive sender patterns for flight emails
@@ -66,7 +65,26 @@ SENDER_PATTERNS = [
     r'concur', r'egencia', r'tripactions', r'navan\.com', r'brex\.com', r'ramp\.com', r'travelperk',
 ]
 
-SENDER_RE = re.compile('|'.join(SENDER_PATTERNS), re.IGNORECASE)
+
+def _split_sender_patterns(patterns):
+    """Separate plain-text patterns from ones that need the regex engine.
+
+    Most sender patterns are literals (only escaped dots), and a substring
+    test is much cheaper than running them through a regex search.
+    """
+    literals = []
+    regexes = []
+    for pattern in patterns:
+        if set(pattern.replace(r'\.', '')) & set(r".^$*+?{}[]|()\\"):
+            regexes.append(pattern)
+        else:
+            literals.append(pattern.replace(r'\.', '.'))
+    return tuple(literals), regexes
+
+
+# Patterns are lowercase; headers are lowercased before matching
+SENDER_LITERALS, _sender_regexes = _split_sender_patterns(SENDER_PATTERNS)
+SENDER_RE = re.compile('|'.join(_sender_regexes))
 
 
 def load_progress():
@@ -99,7 +117,10 @@ def save_results(results):
 
 def quick_header_check(headers_str):
     """Quick check if headers might be a flight email."""
-    return SENDER_RE.search(headers_str) is not None
+    headers_lower = headers_str.lower()
+    if any(literal in headers_lower for literal in SENDER_LITERALS):
+        return True
+    return SENDER_RE.search(headers_lower) is not None
 
 
 def connect_pop3(config):
@@ -189,14 +210,12 @@ def scan_mailbox(config, start_msg=1, batch_size=None, resume=False):
             if not quick_header_check(headers_str):
                 continue
 
-            # Step 2: Parse headers
-            from_match = re.search(r'^From:\s*(.+)$', headers_str, re.M | re.I)
-            subj_match = re.search(r'^Subject:\s*(.+)$', headers_str, re.M | re.I)
-            date_match = re.search(r'^Date:\s*(.+)$', headers_str, re.M | re.I)
-
-            from_addr = from_match.group(1).strip() if from_match else ''
-            subject = subj_match.group(1).strip() if subj_match else ''
-            date_str = date_match.group(1).strip() if date_match else ''
+            # Step 2: Parse headers (default policy decodes encoded-word
+            # subjects and unfolds long headers)
+            header_msg = parse_headers_only(headers_raw)
+            from_addr = get_header(header_msg, 'From')
+            subject = get_header(header_msg, 'Subject')
+            date_str = get_header(header_msg, 'Date')
 
             # Step 3: Check if it's actually a flight email
             is_flight, airline = is_flight_email(from_addr, subject)
@@ -206,7 +225,7 @@ def scan_mailbox(config, start_msg=1, batch_size=None, resume=False):
             # Step 4: Download full message
             resp, msg_lines, _ = pop.retr(msg_num)
             raw_email = b'\n'.join(msg_lines)
-            msg = email.message_from_bytes(raw_email)
+            msg = parse_full(raw_email)
 
             # Parse email date
             try:
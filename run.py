@@ -15,10 +15,12 @@ Usage:
 
 import sys
 import logging
+import threading
 import urllib.request
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 
 # Import from the flighty package
 from flighty import __version__
@@ -26,12 +28,13 @@ from flighty.config import (
     CONFIG_FILE,
     load_config,
     load_processed_flights,
-    save_processed_flights,
+    progress_log,
+    record_processed_flight,
     reset_processed_flights,
     clean_data_files
 )
 from flighty.airports import VALID_AIRPORT_CODES, get_airport_display
-from flighty.email_handler import connect_imap, forward_email
+from flighty.email_handler import connect_imap, close_all_connections, forward_email
 from flighty.scanner import scan_for_flights, select_latest_flights
 from flighty.setup import run_setup
 from flighty.pdf_report import generate_pdf_report
@@ -345,6 +348,70 @@ def display_scan_results(to_forward, skipped, duplicates_merged, processed):
         print()
 
 
+class _SendGate:
+    """Limits concurrent SMTP send attempts; drops to one once throttled."""
+
+    def __init__(self, limit):
+        self._limit = limit
+        self._active = 0
+        self._cond = threading.Condition()
+
+    def throttle(self):
+        """Provider is rate limiting us - from now on send one at a time."""
+        with self._cond:
+            self._limit = 1
+
+    def __enter__(self):
+        with self._cond:
+            while self._active >= self._limit:
+                self._cond.wait()
+            self._active += 1
+        return self
+
+    def __exit__(self, *exc):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+        return False
+
+
+def _flight_summary(flight):
+    """Return (conf, route, date, flight_num) display strings for a flight."""
+    conf = flight.get("confirmation") or "------"
+    flight_info = flight.get("flight_info") or {}
+    airports = flight_info.get("airports") or []
+    dates = flight_info.get("dates") or []
+    flights_list = flight_info.get("flight_numbers") or []
+    route_tuple = flight_info.get("route")
+
+    # Use route tuple if available
+    if route_tuple:
+        valid_airports = list(route_tuple)
+    else:
+        valid_airports = [code for code in airports if code in VALID_AIRPORT_CODES]
+
+    # Format route with airport codes (keep short for header)
+    route = " → ".join(valid_airports[:2]) if valid_airports else ""
+    date = dates[0] if dates else ""
+    flight_num = flights_list[0] if flights_list else ""
+    return conf, route, date, flight_num
+
+
+def _print_flight_details(flight, summary):
+    """Print the From/Subject/Conf/Route lines for an email being forwarded."""
+    conf, route, date, flight_num = summary
+    print(f"        From:    {flight['from_addr'][:60]}")
+    print(f"        Subject: {flight['subject'][:60]}")
+    if conf != "------":
+        print(f"        Conf:    {conf}")
+    if route:
+        print(f"        Route:   {route}")
+    if flight_num:
+        print(f"        Flight:  {flight_num}")
+    if date:
+        print(f"        Date:    {date}")
+
+
 def forward_flights(config, to_forward, processed, dry_run):
     """Forward flights to Flighty."""
     if not to_forward:
@@ -487,88 +554,142 @@ def forward_flights(config, to_forward, processed, dry_run):
 
     sent = 0
     failed = 0
+    not_attempted = 0
+    aborted = False
+    # Parallel sending is opt-in: most providers throttle bulk senders
+    workers = max(1, min(config.get('smtp_workers', 1), len(to_forward)))
+
+    def record_sent(flight, summary, log):
+        conf, route, date, flight_num = summary
+        # Save progress immediately
+        conf_key = conf if conf else f"unknown_{flight['content_hash']}"
+        record_processed_flight(processed, conf_key, {
+            "imported_at": datetime.now().isoformat(),
+            "fingerprint": flight.get("fingerprint", ""),
+            "route": route,
+            "date": date,
+            "flight_number": flight_num
+        }, flight["content_hash"], log)
+
+    with progress_log() as log:
+        if workers == 1:
+            for i, flight in enumerate(to_forward):
+                summary = _flight_summary(flight)
+
+                # Show what email we're sending
+                print()
+                print(f"  [{i+1}/{len(to_forward)}] Sending original email to Flighty:")
+                _print_flight_details(flight, summary)
+
+                success = forward_email(
+                    config,
+                    flight["raw_email"],
+                    flight["from_addr"],
+                    flight["subject"],
+                    flight_info=flight.get("flight_info") or {}
+                )
 
-    for i, flight in enumerate(to_forward):
-        conf = flight.get("confirmation") or "------"
-        flight_info = flight.get("flight_info") or {}
-        airports = flight_info.get("airports") or []
-        dates = flight_info.get("dates") or []
-        flights_list = flight_info.get("flight_numbers") or []
-        route_tuple = flight_info.get("route")
-
-        # Use route tuple if available
-        if route_tuple:
-            valid_airports = list(route_tuple)
-        else:
-            valid_airports = [code for code in airports if code in VALID_AIRPORT_CODES]
-
-        # Format route with airport codes (keep short for header)
-        route = " → ".join(valid_airports[:2]) if valid_airports else ""
-        date = dates[0] if dates else ""
-        flight_num = flights_list[0] if flights_list else ""
-
-        # Show what email we're sending
-        print()
-        print(f"  [{i+1}/{len(to_forward)}] Sending original email to Flighty:")
-        print(f"        From:    {flight['from_addr'][:60]}")
-        print(f"        Subject: {flight['subject'][:60]}")
-        if conf != "------":
-            print(f"        Conf:    {conf}")
-        if route:
-            print(f"        Route:   {route}")
-        if flight_num:
-            print(f"        Flight:  {flight_num}")
-        if date:
-            print(f"        Date:    {date}")
-
-        success = forward_email(
-            config,
-            flight["msg"],
-            flight["from_addr"],
-            flight["subject"],
-            flight_info=flight_info
-        )
+                if success:
+                    print(f"        ✓ Sent successfully")
+                    sent += 1
+                    record_sent(flight, summary, log)
+                else:
+                    failed += 1
 
-        if success:
-            print(f"        ✓ Sent successfully")
-            sent += 1
-
-            # Save progress immediately
-            conf_key = conf if conf else f"unknown_{flight['content_hash']}"
-            processed["confirmations"][conf_key] = {
-                "imported_at": datetime.now().isoformat(),
-                "fingerprint": flight.get("fingerprint", ""),
-                "route": route,
-                "date": date,
-                "flight_number": flight_num
-            }
-            processed["content_hashes"].add(flight["content_hash"])
-            save_processed_flights(processed)
+                    # If the FIRST email fails after all retries, stop
+                    # This indicates a systemic issue (rate limiting, auth problem, etc.)
+                    if i == 0:
+                        aborted = True
+                        break
         else:
-            failed += 1
+            # Every attempt, retries included, goes through the gate; once
+            # the provider throttles us it only lets one send through at a time
+            gate = _SendGate(workers)
+            cancelled = threading.Event()
+
+            def send(flight):
+                if cancelled.is_set():
+                    return None, ""  # Aborted before this one started
+                status = []
+                success = forward_email(
+                    config,
+                    flight["raw_email"],
+                    flight["from_addr"],
+                    flight["subject"],
+                    flight_info=flight.get("flight_info") or {},
+                    on_rate_limit=gate.throttle,
+                    send_gate=gate,
+                    report=status.append,
+                    cancelled=cancelled
+                )
+                return success, "".join(status)
 
-            # If the FIRST email fails after all retries, exit gracefully
-            # This indicates a systemic issue (rate limiting, auth problem, etc.)
-            if i == 0:
-                print()
-                print("  ╔════════════════════════════════════════════════════════════╗")
-                print("  ║  UNABLE TO SEND EMAILS                                     ║")
-                print("  ╚════════════════════════════════════════════════════════════╝")
-                print()
-                print("  The first email failed after all retry attempts.")
-                print("  This usually means:")
-                print()
-                print("    • Your email provider is rate limiting you")
-                print("    • There's a temporary server issue")
-                print("    • Your SMTP settings or credentials need updating")
-                print()
-                print("  What to do:")
-                print("    1. Wait 15-30 minutes and try again")
-                print("    2. If it keeps failing, run: python3 run.py --setup")
-                print()
-                print("  Your flight data has been saved to the PDF in the raw/ folder.")
-                print()
-                return
+            print()
+            print(f"  Sending {len(to_forward)} emails (up to {workers} at a time)...")
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(send, flight): i for i, flight in enumerate(to_forward)}
+
+                done = 0
+                for future in as_completed(futures):
+                    if future.cancelled():
+                        not_attempted += 1
+                        continue
+                    try:
+                        success, status = future.result()
+                    except Exception as e:
+                        success, status = False, f"\n        Unexpected error sending email: {e}\n"
+                    if success is None:
+                        not_attempted += 1
+                        continue
+                    done += 1
+
+                    flight = to_forward[futures[future]]
+                    summary = _flight_summary(flight)
+
+                    # Workers don't print - show this email's retries with its result
+                    print()
+                    print(f"  [{done}/{len(to_forward)}] Original email to Flighty:")
+                    _print_flight_details(flight, summary)
+                    if status:
+                        print(status, end="" if status.endswith("\n") else "\n")
+
+                    if success:
+                        print(f"        ✓ Sent successfully")
+                        sent += 1
+                        record_sent(flight, summary, log)
+                    else:
+                        print(f"        ✗ Not sent")
+                        failed += 1
+
+                        # If nothing has gone through yet, stop queued sends and
+                        # in-flight retries - this indicates a systemic issue
+                        if sent == 0 and not aborted:
+                            aborted = True
+                            cancelled.set()
+                            for pending in futures:
+                                pending.cancel()
+
+    if aborted and sent == 0:
+        print()
+        print("  ╔════════════════════════════════════════════════════════════╗")
+        print("  ║  UNABLE TO SEND EMAILS                                     ║")
+        print("  ╚════════════════════════════════════════════════════════════╝")
+        print()
+        print("  The first email failed after all retry attempts.")
+        print("  This usually means:")
+        print()
+        print("    • Your email provider is rate limiting you")
+        print("    • There's a temporary server issue")
+        print("    • Your SMTP settings or credentials need updating")
+        print()
+        print("  What to do:")
+        print("    1. Wait 15-30 minutes and try again")
+        print("    2. If it keeps failing, run: python3 run.py --setup")
+        print()
+        print("  Your flight data has been saved to the PDF in the raw/ folder.")
+        print()
+        return
 
     print()
     print("  ─" * 35)
@@ -578,6 +699,8 @@ def forward_flights(config, to_forward, processed, dry_run):
     print(f"    ✓ Successfully sent: {sent}")
     if failed > 0:
         print(f"    ✗ Failed: {failed} (run again to retry)")
+    if not_attempted > 0:
+        print(f"    - Not attempted: {not_attempted} (run again to send)")
     print()
 
 
@@ -611,6 +734,68 @@ def check_imap_limitation(config, flight_count, oldest_flight_date):
     return False
 
 
+def scan_folders(config, mail, processed, since):
+    """Scan every configured folder, in parallel when there are several.
+
+    Each worker thread scans over its own IMAP connection, since one
+    connection can only run one command at a time; the first one takes
+    over the already-open `mail` connection. All folders search from the
+    same start date.
+
+    Returns:
+        Tuple: (all_flights dict, all_skipped list)
+    """
+    folders = config['check_folders']
+    workers = min(len(folders), config.get('imap_workers', 4))
+
+    results = {}
+    if workers <= 1:
+        for folder in folders:
+            print()
+            print(f"  Scanning folder: {folder}")
+            results[folder] = scan_for_flights(mail, config, folder, processed, since=since)
+    else:
+        spare = [mail]
+        spare_lock = threading.Lock()
+        local = threading.local()
+
+        def scan(folder):
+            # Workers don't print - the folder's summary line comes back
+            # with its result
+            lines = []
+            folder_mail = getattr(local, 'mail', None)
+            if folder_mail is None:
+                with spare_lock:
+                    folder_mail = spare.pop() if spare else None
+                if folder_mail is None:
+                    folder_mail = connect_imap(config)
+                local.mail = folder_mail
+            if not folder_mail:
+                return ({}, []), [f"    Could not connect to scan folder: {folder}"]
+            result = scan_for_flights(folder_mail, config, folder, processed, since=since,
+                                      report=lines.append)
+            return result, lines or [f"  ✓ {folder}: no flight emails found"]
+
+        print()
+        print(f"  Scanning {len(folders)} folders in parallel...")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(scan, folder): folder for folder in folders}
+            for future in as_completed(futures):
+                result, lines = future.result()
+                for line in lines:
+                    print(line)
+                results[futures[future]] = result
+
+    # Merge in configured folder order so results don't depend on timing
+    all_flights = {}
+    all_skipped = []
+    for folder in folders:
+        flights, skipped = results[folder]
+        all_flights.update(flights)
+        all_skipped.extend(skipped)
+    return all_flights, all_skipped
+
+
 def run(dry_run=False, days_override=None, full_scan=False):
     """Main run function."""
     config = load_config()
@@ -671,20 +856,10 @@ def run(dry_run=False, days_override=None, full_scan=False):
     print("  STEP 3 OF 4: SCANNING FOR FLIGHTS")
     print("=" * 60)
 
-    all_flights = {}
-    all_skipped = []
-
-    for folder in config['check_folders']:
-        print()
-        print(f"  Scanning folder: {folder}")
-        flights, skipped = scan_for_flights(mail, config, folder, processed)
-        all_flights.update(flights)
-        all_skipped.extend(skipped)
+    since = datetime.now() - timedelta(days=config['days_back'])
+    all_flights, all_skipped = scan_folders(config, mail, processed, since)
 
-    try:
-        mail.logout()
-    except Exception:
-        pass
+    close_all_connections()
 
     print()
     print("  Email scan complete. Analyzing results...")
@@ -765,7 +940,10 @@ def run(dry_run=False, days_override=None, full_scan=False):
     print("  STEP 4 OF 4: FORWARDING TO FLIGHTY")
     print("=" * 70)
 
-    forward_flights(config, to_forward, processed, dry_run)
+    try:
+        forward_flights(config, to_forward, processed, dry_run)
+    finally:
+        close_all_connections()
 
     print()
     print("=" * 70)